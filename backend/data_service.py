@@ -1,8 +1,23 @@
+import base64
+import itertools
+import json
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from functools import lru_cache
 
+from percentiles import PercentileTable, percentile_matrices
+from predictions import (
+    MODEL_FILES, MODEL_VERSION_ATTR, PREDICTION_COLUMN, PREDICTION_PREFIX, FeaturePipeline,
+    CURRENT_FILE, add_predictions, default_model_dir, get_pipeline, open_models
+)
+from query_engine import PlayerQueryEngine
+from similarity import SimilarityIndex
+from reloader import DataReloader
+from snapshot import Snapshot, ensure_snapshot, load_snapshot, snapshot_path_for, source_version
+from whatif import WhatIfScorer, current_value
+
 
 ROLE_GROUP_MAP = {
     "Goalkeeper": "GK",
@@ -44,21 +59,228 @@ RADAR_SKILLS = {
     ]
 }
 
+SORT_COL_MAP = {
+    "marketValue": "MarketValueCurrent",
+    "rating": "rating",
+    "name": "name",
+    "age": "age",
+    "goals": "goals",
+    "predictedValue": PREDICTION_COLUMN
+}
+
+# Columns backing the min/max range filters of get_players
+RANGE_COL_MAP = {
+    "age": "age",
+    "value": "MarketValueCurrent",
+    "rating": "rating",
+    "minutes": "minutesPlayed"
+}
+
+DETAIL_CACHE_SIZE = 4096
+
+# Every service built in this process gets the next number, so a swapped-in
+# dataset always has a newer ``version`` than the one it replaces
+_service_versions = itertools.count(1)
+
+
+def _object_column(values: list) -> np.ndarray:
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _text_column(df: pd.DataFrame, col: str, default) -> np.ndarray:
+    """``str(row.get(col, default))`` for every row."""
+    if col not in df.columns:
+        if isinstance(default, np.ndarray):
+            return default
+        return _object_column([str(default)] * len(df))
+    return _object_column([str(v) for v in df[col].to_numpy()])
+
+
+def _widen(values: np.ndarray) -> np.ndarray:
+    """Float32 values as the float64 of their shortest decimal repr."""
+    return values.astype(str).astype(float)
+
+
+def _number_column(df: pd.DataFrame, col: str, cast=float) -> np.ndarray:
+    """``cast(row[col]) if pd.notna(row.get(col)) else None`` for every row."""
+    out = np.full(len(df), None, dtype=object)
+    if col in df.columns:
+        series = df[col]
+        present = series.notna().to_numpy()
+        values = series.to_numpy()[present]
+        values = _widen(values) if values.dtype == np.float32 else values.astype(float)
+        if cast is int:
+            values = values.astype(np.int64)
+        out[present] = values.tolist()
+    return out
+
+
+def encode_cursor(version: int, sort_col: str, ascending: bool, value, player_id) -> str:
+    """Opaque keyset cursor for the row ``(value, player_id)``.
+
+    Paging resumes by value, so the dataset version is informational: a
+    cursor issued before a reload continues at the same place afterwards.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        value = None
+    payload = {"v": version, "s": sort_col, "a": ascending, "k": value, "id": float(player_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload["k"], (str, int, float, type(None))):
+            raise TypeError(payload["k"])
+        payload["id"] = float(payload["id"])
+        return payload
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _cursor_value_fits(value, column: pd.Series) -> bool:
+    """Whether a cursor's sort value fits the sort column; ``None`` is a missing value."""
+    if value is None:
+        return True
+    if pd.api.types.is_numeric_dtype(column.dtype):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def _range_filters(min_age, max_age, min_value, max_value, min_rating, min_minutes) -> dict:
+    return {
+        RANGE_COL_MAP["age"]: (min_age, max_age),
+        RANGE_COL_MAP["value"]: (min_value, max_value),
+        RANGE_COL_MAP["rating"]: (min_rating, None),
+        RANGE_COL_MAP["minutes"]: (min_minutes, None)
+    }
+
+
+def default_data_path() -> Path:
+    module_dir = Path(__file__).resolve().parent
+    candidate = module_dir / "data" / "cleaned_player_data.csv"
+    if not candidate.exists():
+        candidate = module_dir.parent / "data" / "cleaned_player_data.csv"
+    return candidate
+
 
 class PlayerDataService:
     
-    def __init__(self, data_path: str | Path | None = None):
+    def __init__(
+        self,
+        data_path: str | Path | None = None,
+        use_snapshot: bool = True,
+        snapshot_dir: str | Path | None = None,
+        model_dir: str | Path | None = None
+    ):
         if data_path is None:
-            module_dir = Path(__file__).resolve().parent
-            candidate = module_dir / "data" / "cleaned_player_data.csv"
-            if not candidate.exists():
-                candidate = module_dir.parent / "data" / "cleaned_player_data.csv"
-            data_path = candidate
+            data_path = default_data_path()
         self.data_path = Path(data_path)
+        self.use_snapshot = use_snapshot
+        self.snapshot_dir = snapshot_dir
+        self.model_dir = model_dir
+        self.version = 0
+        self.data_version = ""
+        self._models = None
         self._df = None
+        self._float32_columns = []
+        self._engine = None
+        self._id_index = {}
+        self._summary_columns = {}
+        self._percentiles = None
+        self._position_radar = None
+        self._similarity = None
+        self._whatif = None
+        self._detail_cache = lru_cache(maxsize=DETAIL_CACHE_SIZE)(self._detail_at)
         self._load_data()
     
     def _load_data(self):
+        # version orders the services of this process (result caches);
+        # data_version names the source file and the model version behind
+        # the predictions, and is the same in every worker. Taken before
+        # reading, so a concurrent rewrite shows up as a new version.
+        snapshot_path = snapshot_path_for(self.data_path, self.snapshot_dir)
+        self.version = next(_service_versions)
+        source = source_version(self.data_path, snapshot_path)
+        # Model files load in the background while the data is read
+        self._models = open_models(self.model_dir)
+        self.data_version = f"{source}-{self._models.version or 'checkpoints'}"
+        
+        # A snapshot already carries positionGroup and radar columns, and
+        # the percentile matrices as arrays
+        snapshot = None
+        if self.use_snapshot:
+            if self.snapshot_dir is not None:
+                # Shared mode: the first worker builds, everyone maps
+                snapshot = ensure_snapshot(self.data_path, self._build_snapshot, snapshot_path)
+            else:
+                snapshot = load_snapshot(self.data_path, snapshot_path)
+        
+        arrays = {}
+        if snapshot is None:
+            self._read_csv()
+        else:
+            self._df, arrays = snapshot
+            if (
+                PREDICTION_COLUMN not in self._df.columns
+                or self._df.attrs.get(MODEL_VERSION_ATTR) != self._models.version
+            ):
+                # Snapshot built before predictions were stored, without the
+                # models, or before another model version was promoted
+                self._add_predictions()
+        
+        self._float32_columns = [c for c in self._df.columns if self._df[c].dtype == np.float32]
+        self._engine = PlayerQueryEngine(
+            self._df, list(SORT_COL_MAP.values()), list(RANGE_COL_MAP.values())
+        )
+        self._build_id_index()
+        self._build_summary_columns()
+        self._percentiles = PercentileTable(self._df, arrays=arrays)
+        self._build_position_radar(arrays)
+        self._similarity = SimilarityIndex(self._df, RADAR_SKILLS)
+        self._build_whatif()
+    
+    def _build_whatif(self):
+        ensemble = self._models.ensemble()
+        if not ensemble:
+            self._whatif = None
+            return
+        self._whatif = WhatIfScorer(ensemble, self._feature_pipeline())
+    
+    def _feature_pipeline(self) -> FeaturePipeline:
+        """The pipeline saved with the models, else one fitted on the served data.
+
+        The fallback leaves out the columns this service adds (position
+        group, radar percentiles, predictions): they were not in the data
+        the models were trained on.
+        """
+        pipeline = get_pipeline(self._models)
+        if pipeline is None:
+            added = [
+                c for c in self._df.columns
+                if c == "positionGroup" or c.startswith("radar_")
+                or c == PREDICTION_COLUMN or c.startswith(PREDICTION_PREFIX)
+            ]
+            pipeline = FeaturePipeline().fit(self._df.drop(columns=added))
+        return pipeline
+    
+    def _build_snapshot(self) -> Snapshot:
+        self._read_csv()
+        self._percentiles = PercentileTable(self._df)
+        self._build_position_radar()
+        return Snapshot(self._df, self.snapshot_arrays())
+    
+    def snapshot_arrays(self) -> dict[str, np.ndarray]:
+        """Derived matrices stored in the snapshot next to the frame."""
+        return {**self._percentiles.arrays(), "position_radar": self._position_radar}
+    
+    def _read_csv(self) -> pd.DataFrame:
         if not self.data_path.exists():
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
         
@@ -67,26 +289,82 @@ class PlayerDataService:
         self._df["positionGroup"] = self._df["position"].map(ROLE_GROUP_MAP).fillna("UNK")
         
         self._calculate_radar_percentiles()
+        # Stored with the frame, so a snapshot carries them to every worker
+        self._add_predictions()
+        return self._df
     
-    def _calculate_radar_percentiles(self):
+    def _add_predictions(self):
+        ensemble = self._models.ensemble()
+        pipeline = self._feature_pipeline() if ensemble else None
+        add_predictions(self._df, ensemble, pipeline, version=self._models.version)
+    
+    def _build_id_index(self):
+        # First occurrence wins, as with the boolean-mask lookup it replaces
+        ids, first = np.unique(self._df["playerId"].to_numpy(), return_index=True)
+        self._id_index = dict(zip(ids.tolist(), first.tolist()))
+        self._detail_cache.cache_clear()
+    
+    def _build_summary_columns(self):
+        """Pre-convert every ``PlayerSummary`` field to Python values, once."""
+        df = self._df
+        ids = df["playerId"].to_numpy().astype(np.int64).tolist() if "playerId" in df.columns else [0] * len(df)
+        team = _text_column(df, "teamName", "Unknown")
+        self._summary_columns = {
+            "playerId": _object_column(ids),
+            "name": _text_column(df, "name", _text_column(df, "player_name", "Unknown")),
+            "teamName": _object_column([t.split(" ~ ")[0] for t in team]),
+            "position": _text_column(df, "position", "Unknown"),
+            "positionGroup": _text_column(df, "positionGroup", "UNK"),
+            "age": _number_column(df, "age"),
+            "marketValue": _number_column(df, "MarketValueCurrent"),
+            "marketValueCurrency": _text_column(df, "MarketValueCurrency", "EUR"),
+            "rating": _number_column(df, "rating"),
+            "appearances": _number_column(df, "appearances", int),
+            "predictedValue": _number_column(df, PREDICTION_COLUMN)
+        }
+    
+    def _radar_inputs(self) -> dict:
+        """Per-player value ranked for each radar axis; ``None`` when the data lacks it."""
+        inputs = {}
         for category, columns in RADAR_SKILLS.items():
             available_cols = [c for c in columns if c in self._df.columns]
             if available_cols:
-                means = self._df[available_cols].apply(
+                inputs[category] = self._df[available_cols].apply(
                     lambda x: pd.to_numeric(x, errors='coerce')
                 ).mean(axis=1, skipna=True)
-                
-                self._df[f"radar_{category}"] = means.rank(pct=True) * 100
             else:
-                self._df[f"radar_{category}"] = 50.0  
+                inputs[category] = None
         
-    
         if "rating" in self._df.columns:
-            self._df["radar_rating"] = pd.to_numeric(
-                self._df["rating"], errors='coerce'
-            ).rank(pct=True) * 100
+            inputs["rating"] = pd.to_numeric(self._df["rating"], errors='coerce')
         else:
-            self._df["radar_rating"] = 50.0
+            inputs["rating"] = None
+        return inputs
+    
+    def _calculate_radar_percentiles(self):
+        for axis, values in self._radar_inputs().items():
+            if values is not None:
+                self._df[f"radar_{axis}"] = values.rank(pct=True) * 100
+            else:
+                self._df[f"radar_{axis}"] = 50.0
+    
+    def _build_position_radar(self, arrays: dict | None = None):
+        """Radar axes ranked within the player's position group, ``(players, axes)``."""
+        shape = (len(self._df), len(RADAR_SKILLS) + 1)
+        if arrays and "position_radar" in arrays and arrays["position_radar"].shape == shape:
+            self._position_radar = arrays["position_radar"]
+            return
+        inputs = self._radar_inputs()
+        values = np.array([
+            np.full(len(self._df), np.nan) if v is None else v.to_numpy(np.float64)
+            for v in inputs.values()
+        ]).reshape(len(inputs), len(self._df))
+        groups, _ = pd.factorize(self._df["positionGroup"])
+        _, within = percentile_matrices(values, groups)
+        for i, v in enumerate(inputs.values()):
+            if v is None:
+                within[:, i] = 50.0
+        self._position_radar = within
     
     def get_players(
         self,
@@ -96,71 +374,168 @@ class PlayerDataService:
         position_group: str = None,
         team: str = None,
         sort_by: str = "marketValue",
-        sort_order: str = "desc"
-    ) -> tuple[list[dict], int]:
-        df = self._df.copy()
+        sort_order: str = "desc",
+        cursor: str = None,
+        min_age: float = None,
+        max_age: float = None,
+        min_value: float = None,
+        max_value: float = None,
+        min_rating: float = None,
+        min_minutes: float = None
+    ) -> tuple[list[dict], int, str | None]:
+        """One page of players, the total match count and the cursor of the next page.
+
+        With ``cursor`` the page starts right after the row it was taken
+        from and ``page`` is ignored; the cursor stays valid across reloads.
+        """
+        sort_col = SORT_COL_MAP.get(sort_by, "MarketValueCurrent")
+        ascending = sort_order.lower() == "asc"
+        start = (page - 1) * limit
+        first_rank = 0
+        if cursor:
+            after = decode_cursor(cursor)
+            if after["s"] != sort_col or after["a"] != ascending or not self._engine.has_order(sort_col):
+                raise ValueError("Cursor was issued for a different sort order")
+            if not _cursor_value_fits(after["k"], self._df[sort_col]):
+                raise ValueError("Invalid cursor")
+            start = 0
+            try:
+                first_rank = self._engine.seek(sort_col, ascending, after["k"], after["id"])
+            except TypeError as exc:
+                raise ValueError("Invalid cursor") from exc
+        rows, total, more = self._engine.select(
+            start,
+            start + limit,
+            search=search,
+            position_group=position_group,
+            team=team,
+            sort_col=sort_col,
+            ascending=ascending,
+            first_rank=first_rank,
+            ranges=_range_filters(min_age, max_age, min_value, max_value, min_rating, min_minutes)
+        )
         
-        # Apply filters
-        if search:
-            search_lower = search.lower()
-            df = df[
-                df["name"].str.lower().str.contains(search_lower, na=False) |
-                df["player_name"].str.lower().str.contains(search_lower, na=False)
-            ]
+        fields = list(self._summary_columns)
+        columns = [self._summary_columns[f][rows] for f in fields]
+        players = [dict(zip(fields, record)) for record in zip(*columns)]
         
-        if position_group and position_group != "ALL":
-            df = df[df["positionGroup"] == position_group]
+        next_cursor = None
+        if more and len(rows) and self._engine.has_order(sort_col):
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                self.version, sort_col, ascending, self._df[sort_col].iat[last], self._df["playerId"].iat[last]
+            )
         
-        if team:
-            df = df[df["teamName"].str.contains(team, case=False, na=False)]
+        return players, total, next_cursor
+    
+    def players_query_key(
+        self,
+        page: int = 1,
+        limit: int = 50,
+        search: str = None,
+        position_group: str = None,
+        team: str = None,
+        sort_by: str = "marketValue",
+        sort_order: str = "desc",
+        cursor: str = None,
+        min_age: float = None,
+        max_age: float = None,
+        min_value: float = None,
+        max_value: float = None,
+        min_rating: float = None,
+        min_minutes: float = None
+    ) -> tuple:
+        """Normalized ``get_players`` arguments; equal keys give equal results."""
+        return (
+            self.version,
+            None if cursor else page,
+            limit,
+            search.lower() if search else None,
+            position_group if position_group and position_group != "ALL" else None,
+            # Team matching ignores case
+            team.lower() if team else None,
+            SORT_COL_MAP.get(sort_by, "MarketValueCurrent"),
+            sort_order.lower() == "asc",
+            cursor or None,
+            (min_age, max_age, min_value, max_value, min_rating, min_minutes)
+        )
+    
+    def get_facets(
+        self,
+        search: str = None,
+        position_group: str = None,
+        team: str = None,
+        min_age: float = None,
+        max_age: float = None,
+        min_value: float = None,
+        max_value: float = None,
+        min_rating: float = None,
+        min_minutes: float = None
+    ) -> dict:
+        """Count ``get_players`` matches per position group and per team.
         
-        # Sort
-        sort_col_map = {
-            "marketValue": "MarketValueCurrent",
-            "rating": "rating",
-            "name": "name",
-            "age": "age",
-            "goals": "goals"
+        Each facet ignores its own filter; teams without matches are left out.
+        """
+        counts = self._engine.facets(
+            search=search,
+            position_group=position_group,
+            team=team,
+            ranges=_range_filters(min_age, max_age, min_value, max_value, min_rating, min_minutes)
+        )
+        team_counts = counts["team"]
+        matched = np.flatnonzero(team_counts)
+        known = [p["id"] for p in self.get_positions() if p["id"] != "ALL"]
+        groups = known + sorted(g for g in counts["positionGroup"] if g not in known)
+        return {
+            "total": counts["total"],
+            "positionGroups": [
+                {"id": g, "count": counts["positionGroup"].get(g, 0)} for g in groups
+            ],
+            "teams": [
+                {"name": t, "count": c}
+                for t, c in zip(self._engine.team_labels[matched].tolist(), team_counts[matched].tolist())
+            ]
         }
-        sort_col = sort_col_map.get(sort_by, "MarketValueCurrent")
-        if sort_col in df.columns:
-            ascending = sort_order.lower() == "asc"
-            df = df.sort_values(by=sort_col, ascending=ascending, na_position='last')
-        
-        total = len(df)
-        
-        # Paginate
-        start = (page - 1) * limit
-        end = start + limit
-        df_page = df.iloc[start:end]
-        
-        # Convert to list of dicts
-        players = []
-        for _, row in df_page.iterrows():
-            players.append({
-                "playerId": int(row.get("playerId", 0)),
-                "name": str(row.get("name", row.get("player_name", "Unknown"))),
-                "teamName": str(row.get("teamName", "Unknown")).split(" ~ ")[0],
-                "position": str(row.get("position", "Unknown")),
-                "positionGroup": str(row.get("positionGroup", "UNK")),
-                "age": float(row["age"]) if pd.notna(row.get("age")) else None,
-                "marketValue": float(row["MarketValueCurrent"]) if pd.notna(row.get("MarketValueCurrent")) else None,
-                "marketValueCurrency": str(row.get("MarketValueCurrency", "EUR")),
-                "rating": float(row["rating"]) if pd.notna(row.get("rating")) else None,
-                "appearances": int(row["appearances"]) if pd.notna(row.get("appearances")) else None
-            })
-        
-        return players, total
+    
+    def suggest_players(self, query: str, limit: int = 10) -> list[dict]:
+        """Get lightweight name matches for autocomplete, most valuable first."""
+        rows, _, _ = self._engine.select(
+            0,
+            limit,
+            search=query,
+            sort_col=SORT_COL_MAP["marketValue"],
+            ascending=False
+        )
+        columns = self._summary_columns
+        return [
+            {"playerId": pid, "name": name, "teamName": team}
+            for pid, name, team in zip(
+                columns["playerId"][rows], columns["name"][rows], columns["teamName"][rows]
+            )
+        ]
     
     def get_player_by_id(self, player_id: int) -> dict | None:
-        """Get detailed player information by ID."""
-        df = self._df[self._df["playerId"] == player_id]
+        """Get detailed player information by ID.
         
-        if df.empty:
+        Payloads are built once per player and cached, so callers must treat
+        the returned dict as read-only.
+        """
+        pos = self._id_index.get(player_id)
+        if pos is None:
             return None
-        
-        row = df.iloc[0]
-        
+        return self._detail_cache(pos)
+    
+    def _detail_at(self, pos: int) -> dict:
+        row = self._df.iloc[pos]
+        if self._float32_columns:
+            row = row.astype(object)
+            row[self._float32_columns] = _widen(
+                np.array([self._df[c].iat[pos] for c in self._float32_columns], dtype=np.float32)
+            )
+        return self._build_player_detail(row)
+    
+    def _build_player_detail(self, row: pd.Series) -> dict:
+        """Build the ``PlayerDetail`` payload for one row."""
         # Determine market value trend
         current = row.get("MarketValueCurrent")
         previous = row.get("MarketValuePrevious")
@@ -196,6 +571,12 @@ class PlayerDataService:
             "marketValuePrevious": float(row["MarketValuePrevious"]) if pd.notna(row.get("MarketValuePrevious")) else None,
             "marketValueCurrency": str(row.get("MarketValueCurrency", "EUR")),
             "marketValueTrend": trend,
+            "predictedValue": float(row[PREDICTION_COLUMN]) if pd.notna(row.get(PREDICTION_COLUMN)) else None,
+            "predictedValues": {
+                name: float(row[PREDICTION_PREFIX + name])
+                for name in MODEL_FILES
+                if pd.notna(row.get(PREDICTION_PREFIX + name))
+            },
             
             # Playing Time
             "appearances": int(row["appearances"]) if pd.notna(row.get("appearances")) else None,
@@ -225,14 +606,7 @@ class PlayerDataService:
             "totalShots": float(row["totalShots"]) if pd.notna(row.get("totalShots")) else None,
             "shotsOnTarget": float(row["shotsOnTarget"]) if pd.notna(row.get("shotsOnTarget")) else None,
             
-            "radar": {
-                "attacking": float(row.get("radar_attacking", 50)),
-                "passing": float(row.get("radar_passing", 50)),
-                "dribbling": float(row.get("radar_dribbling", 50)),
-                "defending": float(row.get("radar_defending", 50)),
-                "physical": float(row.get("radar_physical", 50)),
-                "rating": float(row.get("radar_rating", 50))
-            },
+            "radar": self._build_radar(row),
             
             "detailedStats": {
                 "attacking": {
@@ -266,15 +640,79 @@ class PlayerDataService:
             }
         }
     
-    def get_radar_data(self, player_id: int) -> dict | None:
-        """Get radar chart data for a player."""
-        df = self._df[self._df["playerId"] == player_id]
+    def get_radar_data(self, player_id: int, relative_to: str = "all") -> dict | None:
+        """Get radar chart data for a player.
         
-        if df.empty:
-            return None
+        ``relative_to="position"`` ranks each axis within the player's
+        position group instead of across all players.
+        """
+        if relative_to == "position":
+            pos = self._id_index.get(player_id)
+            if pos is None:
+                return None
+            scores = _widen(self._position_radar[pos]).tolist()
+            return dict(zip([*RADAR_SKILLS, "rating"], scores))
         
-        row = df.iloc[0]
+        player = self.get_player_by_id(player_id)
+        if player is None:
+            return None
+        return player["radar"]
+    
+    def get_similar_players(self, player_id: int, k: int = 10, same_position: bool = False) -> list[dict] | None:
+        """Get the ``k`` players with the most similar per-90 stat profile."""
+        pos = self._id_index.get(player_id)
+        if pos is None:
+            return None
+        rows, scores = self._similarity.neighbours(pos, k, same_group=same_position)
+        fields = list(self._summary_columns)
+        columns = [self._summary_columns[f][rows] for f in fields]
+        return [
+            {**dict(zip(fields, record)), "similarity": score}
+            for *record, score in zip(*columns, scores.tolist())
+        ]
+    
+    @property
+    def predictions_available(self) -> bool:
+        return self._whatif is not None
+    
+    def model_timings(self) -> dict:
+        """Per-model predict latency of the serving ensemble."""
+        return self._models.ensemble().timing_stats()
+    
+    @property
+    def model_version(self) -> str | None:
+        return self._models.version
+    
+    def get_whatif(self, player_id: int, feature: str, values: list[float]) -> dict | None:
+        """Get the player's predicted value with ``feature`` set to each of ``values``.
         
+        Raises ``ValueError`` if the feature cannot be varied for this player.
+        """
+        pos = self._id_index.get(player_id)
+        if pos is None:
+            return None
+        record = self._df.iloc[pos].to_dict()
+        predicted = record.get(PREDICTION_COLUMN)
+        return {
+            "playerId": player_id,
+            "feature": feature,
+            "current": current_value(record, feature),
+            "predictedValue": float(predicted) if pd.notna(predicted) else None,
+            "points": self._whatif.valuations(record, feature, values)
+        }
+    
+    def get_percentiles(self, player_id: int) -> dict | None:
+        """Get the global and within-position percentile of every stat for a player."""
+        pos = self._id_index.get(player_id)
+        if pos is None:
+            return None
+        return {
+            "playerId": player_id,
+            "positionGroup": self._summary_columns["positionGroup"][pos],
+            "percentiles": self._percentiles.row(pos)
+        }
+    
+    def _build_radar(self, row: pd.Series) -> dict:
         return {
             "attacking": float(row.get("radar_attacking", 50)),
             "passing": float(row.get("radar_passing", 50)),
@@ -296,11 +734,33 @@ class PlayerDataService:
     
     def get_teams(self) -> list[str]:
         """Get all unique team names."""
-        teams = self._df["teamName"].str.split(" ~ ").str[0].unique()
-        return sorted([t for t in teams if pd.notna(t)])
+        return self._engine.team_labels.tolist()
 
 
 @lru_cache(maxsize=1)
+def get_reloader() -> DataReloader:
+    """Get the singleton reloader that owns the live data service.
+    
+    Setting ``PLAYER_SNAPSHOT_DIR`` (e.g. ``/dev/shm/football``) shares one
+    memory-mapped snapshot between all uvicorn workers on the host;
+    ``PLAYER_RELOAD_INTERVAL`` sets how often (seconds) the CSV is checked
+    for changes, 0 to disable.
+    """
+    data_path = default_data_path()
+    snapshot_dir = os.environ.get("PLAYER_SNAPSHOT_DIR")
+    return DataReloader(
+        lambda: PlayerDataService(data_path, snapshot_dir=snapshot_dir),
+        data_path,
+        interval=float(os.environ.get("PLAYER_RELOAD_INTERVAL", "30")),
+        # Promoting a model version swaps in new predictions without a restart
+        extra_paths=(default_model_dir() / CURRENT_FILE,)
+    )
+
+
 def get_data_service() -> PlayerDataService:
-    """Get the singleton data service instance."""
-    return PlayerDataService()
+    """Get the current data service instance.
+    
+    Fetch it once per request: a reload swaps in a new instance, and the
+    one already in hand stays valid until the request is done.
+    """
+    return get_reloader().current
@@ -0,0 +1,81 @@
+import hashlib
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+DEFAULT_CACHE_CONTROL = "public, max-age=30, must-revalidate"
+
+
+def normalize_query(query_string: bytes) -> str:
+    """Sorted, blank-free query string, so equivalent URLs share an ETag."""
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=False)
+    return urlencode(sorted(params))
+
+
+def make_etag(version: int | str, path: str, query_string: bytes) -> str:
+    key = f"{version}|{path}|{normalize_query(query_string)}"
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 specifies for ``If-None-Match``."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class DatasetCacheMiddleware:
+    """ETag and Cache-Control for read endpoints, keyed on the dataset version.
+
+    Responses only change when the dataset or the served model version is
+    reloaded, so the ETag is a hash of the version covering both, the path
+    and the normalized query. A matching
+    ``If-None-Match`` is answered with 304 before the endpoint runs.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        version: Callable[[], int | str],
+        prefix: str = "/api/",
+        cache_control: str = DEFAULT_CACHE_CONTROL
+    ):
+        self.app = app
+        self.version = version
+        self.prefix = prefix
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        etag = make_etag(self.version(), scope["path"], scope["query_string"])
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            response = Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": self.cache_control}
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = self.cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -1,16 +1,48 @@
-from fastapi import FastAPI, HTTPException, Query
+import os
+import secrets
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from typing import Optional
 
-from models import PlayerSummary, PlayerDetail, RadarData, PaginatedPlayers
-from data_service import get_data_service
+from models import PlayerSummary, PlayerSuggestion, PlayerDetail, RadarData, PaginatedPlayers, PlayerFacets, PlayerPercentiles, SimilarPlayer, WhatIfValuation
+from data_service import get_data_service, get_reloader
+from http_cache import DatasetCacheMiddleware
+from responses import RESPONSE_COMPRESSION, CompressionMiddleware, encode, fast_response
+from result_cache import ResultCache
+from whatif import WHATIF_FEATURES, parse_grid
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load (or attach to the shared snapshot) before accepting requests
+    reloader = get_reloader()
+    reloader.start()
+    yield
+    reloader.stop()
+
 
 app = FastAPI(
     title="Football Player Dashboard API",
     description="API for the Football Market Prediction demo dashboard",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Serialized /api/players pages, keyed on normalized query and data version
+players_cache = ResultCache(
+    maxsize=int(os.environ.get("PLAYERS_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("PLAYERS_CACHE_TTL", "300"))
+)
+
+# Conditional GETs keyed on the dataset version, which all workers share;
+# added before CORS so 304 responses still carry the CORS headers
+app.add_middleware(DatasetCacheMiddleware, version=lambda: get_data_service().data_version)
+
+if RESPONSE_COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
 # Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -24,7 +56,27 @@ app.add_middleware(
 @app.get("/")
 def root():
     """API health check endpoint."""
-    return {"status": "ok", "message": "Football Player Dashboard API is running"}
+    return {
+        "status": "ok",
+        "message": "Football Player Dashboard API is running",
+        "dataVersion": get_data_service().data_version,
+        "playersCache": players_cache.stats(),
+        "modelTimings": get_data_service().model_timings()
+    }
+
+
+@app.post("/api/admin/reload", status_code=202)
+def reload_data(x_admin_token: Optional[str] = Header(None)):
+    """Rebuild the dataset in the background and swap it in when ready.
+    
+    Disabled unless the ``ADMIN_TOKEN`` environment variable is set.
+    """
+    token = os.environ.get("ADMIN_TOKEN")
+    if not token or not x_admin_token or not secrets.compare_digest(token, x_admin_token):
+        raise HTTPException(status_code=403, detail="Reload not permitted")
+    
+    get_reloader().request_reload()
+    return {"status": "reloading", "dataVersion": get_data_service().data_version}
 
 
 @app.get("/api/players", response_model=PaginatedPlayers)
@@ -35,29 +87,100 @@ def get_players(
     positionGroup: Optional[str] = Query(None, description="Filter by position group (GK, DEF, MID, ATT)"),
     team: Optional[str] = Query(None, description="Filter by team name"),
     sortBy: str = Query("marketValue", description="Sort field"),
-    sortOrder: str = Query("desc", description="Sort order (asc/desc)")
+    sortOrder: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page; replaces page"),
+    minAge: Optional[float] = Query(None, ge=0, description="Minimum age"),
+    maxAge: Optional[float] = Query(None, ge=0, description="Maximum age"),
+    minValue: Optional[float] = Query(None, ge=0, description="Minimum market value"),
+    maxValue: Optional[float] = Query(None, ge=0, description="Maximum market value"),
+    minRating: Optional[float] = Query(None, ge=0, description="Minimum rating"),
+    minMinutes: Optional[float] = Query(None, ge=0, description="Minimum minutes played")
 ):
     """Get paginated list of players with optional filters."""
     service = get_data_service()
-    players, total = service.get_players(
+    query = dict(
         page=page,
         limit=limit,
         search=search,
         position_group=positionGroup,
         team=team,
         sort_by=sortBy,
-        sort_order=sortOrder
+        sort_order=sortOrder,
+        cursor=cursor,
+        min_age=minAge,
+        max_age=maxAge,
+        min_value=minValue,
+        max_value=maxValue,
+        min_rating=minRating,
+        min_minutes=minMinutes
     )
     
-    total_pages = (total + limit - 1) // limit
+    def build_page() -> bytes:
+        players, total, next_cursor = service.get_players(**query)
+        
+        total_pages = (total + limit - 1) // limit
+        
+        return encode({
+            "players": players,
+            "total": total,
+            # Cursor requests share a cache entry whatever page they pass
+            "page": None if cursor else page,
+            "limit": limit,
+            "totalPages": total_pages,
+            "nextCursor": next_cursor
+        }, PaginatedPlayers)
     
-    return {
-        "players": players,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "totalPages": total_pages
-    }
+    try:
+        body = players_cache.get_or_compute(
+            service.players_query_key(**query), build_page, version=service.version
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/players/facets", response_model=PlayerFacets)
+def get_player_facets(
+    search: Optional[str] = Query(None, description="Search by player name"),
+    positionGroup: Optional[str] = Query(None, description="Filter by position group (GK, DEF, MID, ATT)"),
+    team: Optional[str] = Query(None, description="Filter by team name"),
+    minAge: Optional[float] = Query(None, ge=0, description="Minimum age"),
+    maxAge: Optional[float] = Query(None, ge=0, description="Maximum age"),
+    minValue: Optional[float] = Query(None, ge=0, description="Minimum market value"),
+    maxValue: Optional[float] = Query(None, ge=0, description="Maximum market value"),
+    minRating: Optional[float] = Query(None, ge=0, description="Minimum rating"),
+    minMinutes: Optional[float] = Query(None, ge=0, description="Minimum minutes played")
+):
+    """Count /api/players matches per position group and team for the same filters."""
+    service = get_data_service()
+    query = dict(
+        search=search,
+        position_group=positionGroup,
+        team=team,
+        min_age=minAge,
+        max_age=maxAge,
+        min_value=minValue,
+        max_value=maxValue,
+        min_rating=minRating,
+        min_minutes=minMinutes
+    )
+    
+    body = players_cache.get_or_compute(
+        ("facets",) + service.players_query_key(**query),
+        lambda: encode(service.get_facets(**query), PlayerFacets),
+        version=service.version
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/players/suggest", response_model=list[PlayerSuggestion])
+def suggest_players(
+    q: str = Query(..., min_length=1, description="Name fragment"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions")
+):
+    """Get player name suggestions for autocomplete."""
+    service = get_data_service()
+    return fast_response(service.suggest_players(q, limit=limit))
 
 
 @app.get("/api/players/{player_id}", response_model=PlayerDetail)
@@ -69,33 +192,86 @@ def get_player(player_id: int):
     if player is None:
         raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
     
-    return player
+    return fast_response(player)
 
 
 @app.get("/api/players/{player_id}/radar", response_model=RadarData)
-def get_player_radar(player_id: int):
+def get_player_radar(
+    player_id: int,
+    relativeTo: str = Query("all", pattern="^(all|position)$", description="Rank against all players or the player's position group")
+):
     """Get radar chart data for a player."""
     service = get_data_service()
-    radar = service.get_radar_data(player_id)
+    radar = service.get_radar_data(player_id, relative_to=relativeTo)
     
     if radar is None:
         raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
     
-    return radar
+    return fast_response(radar)
+
+
+@app.get("/api/players/{player_id}/similar", response_model=list[SimilarPlayer])
+def get_similar_players(
+    player_id: int,
+    k: int = Query(10, ge=1, le=100, description="Number of similar players"),
+    samePosition: bool = Query(False, description="Only players in the same position group")
+):
+    """Get the players whose per-90 stat profile is closest to this player's."""
+    service = get_data_service()
+    similar = service.get_similar_players(player_id, k=k, same_position=samePosition)
+    
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+    
+    return fast_response(similar)
+
+
+@app.get("/api/players/{player_id}/whatif", response_model=WhatIfValuation)
+def get_player_whatif(
+    player_id: int,
+    feature: str = Query(..., pattern="^(" + "|".join(WHATIF_FEATURES) + ")$", description="Input to vary"),
+    values: str = Query(..., description="Comma-separated values of the input")
+):
+    """Get the player's predicted market value with one input set to each of the given values."""
+    service = get_data_service()
+    if not service.predictions_available:
+        raise HTTPException(status_code=503, detail="Predictions are not available")
+    try:
+        grid = parse_grid(values)
+        valuation = service.get_whatif(player_id, feature, grid)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    if valuation is None:
+        raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+    
+    return fast_response(valuation)
+
+
+@app.get("/api/players/{player_id}/percentiles", response_model=PlayerPercentiles)
+def get_player_percentiles(player_id: int):
+    """Get a player's percentile for every stat, overall and within position group."""
+    service = get_data_service()
+    percentiles = service.get_percentiles(player_id)
+    
+    if percentiles is None:
+        raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+    
+    return fast_response(percentiles)
 
 
 @app.get("/api/positions")
 def get_positions():
     """Get available position groups for filtering."""
     service = get_data_service()
-    return service.get_positions()
+    return fast_response(service.get_positions())
 
 
 @app.get("/api/teams")
 def get_teams():
     """Get all available team names."""
     service = get_data_service()
-    return service.get_teams()
+    return fast_response(service.get_teams())
 
 
 if __name__ == "__main__":
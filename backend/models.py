@@ -13,6 +13,31 @@ class PlayerSummary(BaseModel):
     marketValueCurrency: str = "EUR"
     rating: Optional[float] = None
     appearances: Optional[int] = None
+    predictedValue: Optional[float] = None
+
+
+class SimilarPlayer(PlayerSummary):
+    similarity: float
+
+
+class WhatIfPoint(BaseModel):
+    value: float
+    predictedValue: float
+    predictedValues: dict[str, float] = {}
+
+
+class WhatIfValuation(BaseModel):
+    playerId: int
+    feature: str
+    current: Optional[float] = None
+    predictedValue: Optional[float] = None
+    points: list[WhatIfPoint]
+
+
+class PlayerSuggestion(BaseModel):
+    playerId: int
+    name: str
+    teamName: str
 
 
 class RadarData(BaseModel):
@@ -24,6 +49,17 @@ class RadarData(BaseModel):
     rating: float
 
 
+class StatPercentile(BaseModel):
+    overall: Optional[float] = None
+    position: Optional[float] = None
+
+
+class PlayerPercentiles(BaseModel):
+    playerId: int
+    positionGroup: str
+    percentiles: dict[str, StatPercentile]
+
+
 class AttackingStats(BaseModel):
     Goals: int = 0
     xG: float = 0
@@ -87,6 +123,8 @@ class PlayerDetail(BaseModel):
     marketValuePrevious: Optional[float] = None
     marketValueCurrency: str = "EUR"
     marketValueTrend: str = "stable"  # up, down, stable
+    predictedValue: Optional[float] = None  # mean of the model predictions
+    predictedValues: dict[str, float] = {}  # per model
     
     # Playing Time
     appearances: Optional[int] = None
@@ -125,7 +163,23 @@ class PlayerDetail(BaseModel):
 class PaginatedPlayers(BaseModel):
     players: list[PlayerSummary]
     total: int
-    page: int
+    # None for cursor pages, which do not have a page number
+    page: Optional[int] = None
     limit: int
     totalPages: int
+    nextCursor: Optional[str] = None
 
+class FacetCount(BaseModel):
+    id: str
+    count: int
+
+
+class TeamCount(BaseModel):
+    name: str
+    count: int
+
+
+class PlayerFacets(BaseModel):
+    total: int
+    positionGroups: list[FacetCount]
+    teams: list[TeamCount]
@@ -0,0 +1,126 @@
+"""Per-stat percentile matrix, across all players and within position group.
+
+Percentiles follow ``Series.rank(pct=True) * 100``: ties share their
+average rank and missing values stay missing. Each stat is sorted once;
+the within-group ranks reuse that order with a stable sort on the group
+code, so no per-group pass over the frame is needed.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from column_groups import COLUMN_GROUPS
+except ImportError:
+    # Running from a checkout, where the column groups live in eda/
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "eda"))
+    from column_groups import COLUMN_GROUPS
+
+
+# Groups holding identifiers and codes rather than stats
+EXCLUDED_GROUPS = ["identifiers_metadata", "position_role"]
+
+
+def stat_columns(df: pd.DataFrame) -> list[str]:
+    """Numeric ``COLUMN_GROUPS`` stats present in ``df``, in group order."""
+    columns = []
+    for group, group_columns in COLUMN_GROUPS.items():
+        if group in EXCLUDED_GROUPS:
+            continue
+        for col in group_columns:
+            if (
+                col in df.columns
+                and not col.endswith("Id")
+                and pd.api.types.is_numeric_dtype(df[col].dtype)
+            ):
+                columns.append(col)
+    return list(dict.fromkeys(columns))
+
+
+def _sorted_percentiles(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Percentile of each element of ``values``, sorted by ``(groups, values)``."""
+    n = len(values)
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = groups[1:] != groups[:-1]
+    new_block = new_group.copy()
+    new_block[1:] |= values[1:] != values[:-1]
+
+    group_starts = np.flatnonzero(new_group)
+    group_sizes = np.diff(np.append(group_starts, n))
+    block_starts = np.flatnonzero(new_block)
+    block_ends = np.append(block_starts[1:], n)
+    block_group = (np.cumsum(new_group) - 1)[block_starts]
+
+    # Average 1-based rank of each tie block, relative to its group
+    rank = (block_starts + block_ends + 1) / 2 - group_starts[block_group]
+    pct = rank / group_sizes[block_group] * 100
+    return pct[np.cumsum(new_block) - 1]
+
+
+def percentile_matrices(values: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Global and within-group float32 percentiles of every row of ``values``.
+
+    ``values`` is ``(stats, players)``, one contiguous row per stat to sort;
+    the results are ``(players, stats)``, one contiguous row per player to
+    look up. ``groups`` holds an integer group code per player.
+    """
+    k, n = values.shape
+    overall = np.full((n, k), np.nan, dtype=np.float32)
+    within = np.full((n, k), np.nan, dtype=np.float32)
+    no_group = np.zeros(n, dtype=np.int16)
+    # Small integer codes get numpy's radix sort for the stable group pass
+    groups = groups.astype(np.int16 if groups.max(initial=0) < 2 ** 15 else np.intp)
+    for j in range(k):
+        column = values[j]
+        order = np.argsort(column, kind="stable")
+        order = order[~np.isnan(column[order])]
+        if len(order) == 0:
+            continue
+        overall[order, j] = _sorted_percentiles(column[order], no_group[:len(order)])
+
+        # Stable on the group code, so values stay sorted inside each group
+        order = order[np.argsort(groups[order], kind="stable")]
+        within[order, j] = _sorted_percentiles(column[order], groups[order])
+    return overall, within
+
+
+class PercentileTable:
+    """Percentile matrices for the stats of one player frame.
+
+    Both are ``(players, stats)`` with players in frame order, so a lookup
+    reads one contiguous row of each. They are stored in the snapshot
+    (``arrays``), so workers sharing it map one copy instead of each
+    ranking every stat.
+    """
+
+    ARRAYS = ("percentiles_overall", "percentiles_within")
+
+    def __init__(self, df: pd.DataFrame, group_col: str = "positionGroup", arrays: dict | None = None):
+        self.columns = stat_columns(df)
+        shape = (len(df), len(self.columns))
+        if arrays and all(name in arrays and arrays[name].shape == shape for name in self.ARRAYS):
+            self.overall, self.within = (arrays[name] for name in self.ARRAYS)
+            return
+        values = np.array([
+            pd.to_numeric(df[c], errors="coerce").to_numpy(np.float64) for c in self.columns
+        ]).reshape(len(self.columns), len(df))
+        groups, _ = pd.factorize(df[group_col])
+        self.overall, self.within = percentile_matrices(values, groups)
+
+    def arrays(self) -> dict:
+        return dict(zip(self.ARRAYS, (self.overall, self.within)))
+
+    def row(self, pos: int) -> dict:
+        """``{stat: {"overall": pct, "position": pct}}`` for one row; ``None`` if missing."""
+        # Float32 values as the float64 of their shortest decimal repr
+        overall = self.overall[pos].astype(str).astype(float).tolist()
+        within = self.within[pos].astype(str).astype(float).tolist()
+        return {
+            col: {
+                "overall": None if np.isnan(o) else o,
+                "position": None if np.isnan(w) else w
+            }
+            for col, o, w in zip(self.columns, overall, within)
+        }
@@ -0,0 +1,182 @@
+"""Batch market value predictions from the trained checkpoints.
+
+The XGBoost, LightGBM and CatBoost checkpoints in ``models/checkpoints``
+predict the log change in market value from the features
+``feature_pipeline.py`` builds, using the pipeline ``data_final.py`` saved
+with them. ``add_predictions`` runs the ensemble of every available
+model (``models/ensemble.py``, members in parallel) once over the whole
+frame and reconstructs values the way ``models/eval.py`` does::
+
+    predicted = expm1(log1p(MarketValuePrevious) + delta)
+
+The combined value reconstructs from the ensemble's combined delta.
+
+Models come from the promoted version of the registry in the model
+directory (``models/registry.py``), or from the pickled checkpoints when
+nothing has been promoted. The model libraries are optional: without them
+(or without the checkpoints) the service runs with no predictions.
+"""
+import logging
+import os
+import warnings
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from reloader import file_stamp
+
+try:
+    from feature_pipeline import FeaturePipeline
+except ImportError:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from feature_pipeline import FeaturePipeline
+
+try:
+    from ensemble import EnsemblePredictor
+    from registry import CURRENT_FILE, PIPELINE_FILE, ModelRegistry, ModelSet
+except ImportError:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "models"))
+    from ensemble import EnsemblePredictor
+    from registry import CURRENT_FILE, PIPELINE_FILE, ModelRegistry, ModelSet
+
+try:
+    import joblib
+except ImportError:
+    joblib = None
+
+logger = logging.getLogger(__name__)
+
+
+MODEL_FILES = {
+    "xgb": "xgb_model.pkl",
+    "lgbm": "lgbm_model.pkl",
+    "catboost": "catboost_model.pkl"
+}
+
+# Ensemble of the available models; per-model values go in PREDICTION_PREFIX + name
+PREDICTION_COLUMN = "PredictedValue"
+PREDICTION_PREFIX = "PredictedValue_"
+
+# Frame attribute naming the model version behind the stored predictions
+MODEL_VERSION_ATTR = "modelVersion"
+
+
+def default_model_dir() -> Path:
+    if os.environ.get("MODEL_DIR"):
+        return Path(os.environ["MODEL_DIR"])
+    module_dir = Path(__file__).resolve().parent
+    candidate = module_dir / "checkpoints"
+    if not candidate.exists():
+        candidate = module_dir.parent / "models" / "checkpoints"
+    return candidate
+
+
+def _pickle_models(model_dir: Path) -> ModelSet:
+    if joblib is None:
+        logger.warning("joblib is not installed; serving without predictions")
+        return ModelSet({})
+    loaders = {
+        name: (lambda path=model_dir / filename: joblib.load(path))
+        for name, filename in MODEL_FILES.items()
+        if (model_dir / filename).exists()
+    }
+    return ModelSet(loaders, pipeline_path=model_dir / PIPELINE_FILE)
+
+
+@lru_cache(maxsize=1)
+def _open_models(model_dir: Path, stamps: tuple) -> ModelSet:
+    registry = ModelRegistry(model_dir)
+    if registry.current_version() is not None:
+        try:
+            return registry.open()
+        except Exception:
+            logger.exception("Could not open model version %s; using the pickled checkpoints", registry.current_version())
+    return _pickle_models(model_dir)
+
+
+def open_models(model_dir: str | Path | None = None) -> ModelSet:
+    """The promoted registry version, else the pickled checkpoints.
+
+    Loading runs in the background; the same set is returned until the
+    promoted version or the checkpoint files change.
+    """
+    model_dir = Path(model_dir) if model_dir else default_model_dir()
+    stamps = (
+        file_stamp(model_dir / CURRENT_FILE),
+        *(file_stamp(model_dir / f) for f in MODEL_FILES.values())
+    )
+    return _open_models(model_dir, stamps)
+
+
+def get_ensemble(model_dir: str | Path | None = None) -> EnsemblePredictor:
+    """Ensemble of the served models, reused until they change."""
+    return open_models(model_dir).ensemble()
+
+
+@lru_cache(maxsize=1)
+def _load_pipeline(path: Path, stamp) -> FeaturePipeline | None:
+    if stamp is None:
+        return None
+    try:
+        return FeaturePipeline.load(path)
+    except (OSError, ValueError, KeyError):
+        logger.exception("Could not load %s; fitting features on the served data", path)
+        return None
+
+
+def get_pipeline(models: ModelSet) -> FeaturePipeline | None:
+    """The feature pipeline saved with ``models``, if there is one."""
+    path = models.pipeline_path
+    if path is None:
+        return None
+    return _load_pipeline(path, file_stamp(path))
+
+
+def predict_values(
+    df: pd.DataFrame,
+    ensemble: EnsemblePredictor,
+    pipeline: FeaturePipeline | None = None
+) -> tuple[dict[str, np.ndarray], np.ndarray]:
+    """Predicted current market value of every row, per model and combined.
+
+    Without a saved ``pipeline`` one is fitted on ``df`` itself, which
+    matches training when ``df`` is the data the models were trained on.
+    """
+    if pipeline is None:
+        pipeline = FeaturePipeline().fit(df)
+    features = pipeline.transform(df)
+    previous = pd.to_numeric(df["MarketValuePrevious"], errors="coerce").fillna(0)
+    previous_log = np.log1p(previous.to_numpy(np.float64))
+    deltas = ensemble.predict_all(features)
+    per_model = {name: np.expm1(previous_log + delta) for name, delta in deltas.items()}
+    return per_model, np.expm1(previous_log + ensemble.combine(deltas))
+
+
+def add_predictions(
+    df: pd.DataFrame,
+    ensemble: EnsemblePredictor,
+    pipeline: FeaturePipeline | None = None,
+    version: str | None = None
+) -> bool:
+    """Store per-model and combined predictions as columns; whether any model ran.
+
+    ``version`` is recorded in ``df.attrs`` (and so in a snapshot of ``df``).
+    """
+    stale = [c for c in df.columns if c == PREDICTION_COLUMN or c.startswith(PREDICTION_PREFIX)]
+    if stale:
+        df.drop(columns=stale, inplace=True)
+    df.attrs[MODEL_VERSION_ATTR] = version
+    if not ensemble or "MarketValuePrevious" not in df.columns:
+        return False
+    per_model, combined = predict_values(df, ensemble, pipeline)
+    with warnings.catch_warnings():
+        # Snapshot frames keep one memory-mapped block per column on purpose
+        warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+        for name, values in per_model.items():
+            df[PREDICTION_PREFIX + name] = values
+        df[PREDICTION_COLUMN] = combined
+    return True
@@ -0,0 +1,405 @@
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+NGRAM_SIZE = 3
+
+# Search text containing any of these is a regex for ``str.contains``
+REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+def fold_text(text: str) -> str:
+    """Strip accents and casefold, one character at a time.
+
+    Folding is per character, so a substring of ``text`` always folds to a
+    substring of ``fold_text(text)``; the n-gram index relies on that.
+    """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _sort_keys(values: np.ndarray, ids: np.ndarray, ascending: bool) -> tuple:
+    """Order rows by value, then by player id, with missing values last.
+
+    Returns the permutation, the integer sort key of each row along it
+    (non-decreasing, so it can be binary searched) and the sorted distinct
+    values the keys index into.
+    """
+    missing = pd.isna(values)
+    valid = np.flatnonzero(~missing)
+    uniques, codes = np.unique(values[valid], return_inverse=True)
+    keys = np.full(len(values), len(uniques) + 1, dtype=np.int64)
+    keys[valid] = codes if ascending else -codes
+    order = np.lexsort((ids, keys)).astype(np.intp, copy=False)
+    return order, keys[order], uniques
+
+
+def intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersect two sorted arrays of unique row positions."""
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) == 0:
+        return b
+    idx = np.searchsorted(a, b)
+    idx[idx == len(a)] = 0
+    return b[a[idx] == b]
+
+
+class NameSearchIndex:
+    """Trigram inverted index over accent-folded, lowercased names.
+
+    Queries intersect the posting lists of their trigrams and then verify
+    each candidate with a plain substring test on the lowercased names, so
+    results are exactly those of ``str.lower().str.contains``. Queries that
+    are too short for a trigram or contain regex syntax fall back to that
+    scan.
+    """
+
+    def __init__(self, *columns: pd.Series):
+        self._lowered = [col.str.lower() for col in columns]
+        self._values = [
+            np.where(col.notna(), col, None).astype(object) for col in self._lowered
+        ]
+
+        postings = defaultdict(list)
+        for row, names in enumerate(zip(*self._values)):
+            grams = set()
+            for name in set(names):
+                if name is not None:
+                    grams |= _ngrams(fold_text(name))
+            for gram in grams:
+                postings[gram].append(row)
+        self._postings = {
+            gram: np.array(rows, dtype=np.intp) for gram, rows in postings.items()
+        }
+
+    def _scan(self, search_lower: str) -> np.ndarray:
+        mask = np.zeros(len(self._values[0]), dtype=bool)
+        for lowered in self._lowered:
+            mask |= lowered.str.contains(search_lower, na=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def search(self, search: str) -> np.ndarray:
+        """Sorted row positions whose names contain ``search``."""
+        search_lower = search.lower()
+        key = fold_text(search_lower)
+        if len(key) < NGRAM_SIZE or REGEX_CHARS.intersection(search_lower):
+            return self._scan(search_lower)
+
+        lists = []
+        for gram in _ngrams(key):
+            rows = self._postings.get(gram)
+            if rows is None:
+                return np.empty(0, dtype=np.intp)
+            lists.append(rows)
+        lists.sort(key=len)
+
+        candidates = lists[0]
+        for rows in lists[1:]:
+            candidates = intersect_sorted(candidates, rows)
+
+        matches = [
+            row for row in candidates.tolist()
+            if any(v[row] is not None and search_lower in v[row] for v in self._values)
+        ]
+        return np.array(matches, dtype=np.intp)
+
+
+class PlayerQueryEngine:
+    """Read-only indexes over the player frame, built once per load.
+
+    Sort orders are full permutations of the frame for every sortable column
+    in both directions, ties broken by player id; filters resolve to sorted
+    arrays of row positions (name search through ``NameSearchIndex``) which
+    are intersected and then ranked against the requested order. Range
+    filters binary search a value-sorted copy of their column. Keyset
+    cursors ``(value, playerId)`` resume by binary search on the sort keys.
+    """
+
+    def __init__(self, df: pd.DataFrame, sort_columns: list[str], range_columns: list[str] = ()):
+        self._n = len(df)
+        self._all_rows = np.arange(self._n, dtype=np.intp)
+        ids = df["playerId"].to_numpy()
+
+        # Sort permutations, their inverses (row -> rank) and sort keys
+        self._orders = {}
+        self._ranks = {}
+        self._keys = {}
+        self._ordered_ids = {}
+        self._uniques = {}
+        for col in dict.fromkeys(sort_columns):
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            for ascending in (True, False):
+                key = (col, ascending)
+                order, self._keys[key], self._uniques[key] = _sort_keys(values, ids, ascending)
+                rank = np.empty(self._n, dtype=np.intp)
+                rank[order] = self._all_rows
+                self._orders[key] = order
+                self._ranks[key] = rank
+                self._ordered_ids[key] = ids[order]
+
+        # Range columns: values by row, and the non-missing ones in ascending
+        # order along with their rows
+        self._range_columns = {}
+        self._range_values = {}
+        self._range_rows = {}
+        for col in dict.fromkeys(range_columns):
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy()
+            valid = np.flatnonzero(~np.isnan(values))
+            order = valid[np.argsort(values[valid], kind="stable")]
+            self._range_columns[col] = values
+            self._range_values[col] = values[order]
+            self._range_rows[col] = order
+
+        # Position group codes and postings
+        self._group_codes, labels = pd.factorize(df["positionGroup"])
+        self._group_labels = list(labels)
+        self._group_rows = {
+            g: np.flatnonzero(self._group_codes == i) for i, g in enumerate(self._group_labels)
+        }
+
+        # Team postings keyed by factorized team name
+        codes, uniques = pd.factorize(df["teamName"])
+        self._team_codes = codes
+        self._team_names = pd.Series(uniques, dtype=object)
+        by_code = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[by_code], np.arange(len(uniques) + 1))
+        self._team_rows = [
+            by_code[bounds[i]:bounds[i + 1]] for i in range(len(uniques))
+        ]
+
+        # Cleaned team name ("Club ~ League" -> "Club") of every row as a
+        # code into the name-sorted ``team_labels``, shifted by one so that 0
+        # means no team; the trailing entry maps missing teams (code -1) there
+        clean_codes, clean_names = pd.factorize(self._team_names.str.split(" ~ ").str[0], sort=True)
+        self.team_labels = np.asarray(clean_names, dtype=object)
+        self._clean_team_codes = np.append(clean_codes + 1, 0)[codes]
+
+        self._names = NameSearchIndex(df["name"], df["player_name"])
+
+        self._unfiltered_facets = None
+        self._unfiltered_facets = self.facets()
+
+    def search_rows(self, search: str) -> np.ndarray:
+        return self._names.search(search)
+
+    def position_rows(self, position_group: str) -> np.ndarray:
+        return self._group_rows.get(position_group, self._all_rows[:0])
+
+    def _matching_teams(self, team: str) -> np.ndarray:
+        """Which factorized team names contain ``team``, case-insensitively."""
+        return self._team_names.str.contains(team, case=False, na=False).to_numpy()
+
+    def team_rows(self, team: str) -> np.ndarray:
+        matched = np.flatnonzero(self._matching_teams(team))
+        if len(matched) == 0:
+            return self._all_rows[:0]
+        if len(matched) == 1:
+            return self._team_rows[matched[0]]
+        return np.sort(np.concatenate([self._team_rows[i] for i in matched]))
+
+    def _range_bounds(self, col: str, low, high) -> tuple:
+        """Bounds cast to the column's precision, so float32 data matches its CSV values."""
+        values = self._range_values[col]
+        cast = values.dtype.type if values.dtype.kind == "f" else float
+        return (None if low is None else cast(low)), (None if high is None else cast(high))
+
+    def range_span(self, col: str, low=None, high=None) -> tuple[int, int]:
+        """Slice of the value-sorted rows of ``col`` within ``[low, high]``."""
+        values = self._range_values[col]
+        low, high = self._range_bounds(col, low, high)
+        lo = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        hi = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        return lo, max(lo, hi)
+
+    def within_range(self, rows: np.ndarray, col: str, low=None, high=None) -> np.ndarray:
+        """The subset of sorted ``rows`` whose ``col`` lies in ``[low, high]``."""
+        values = self._range_columns[col][rows]
+        low, high = self._range_bounds(col, low, high)
+        keep = ~np.isnan(values)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return rows[keep]
+
+    def _filter_rows(self, sets: list, ranges: dict) -> np.ndarray | None:
+        """Intersect posting lists and range filters, smallest input first.
+
+        Range sizes come from binary search alone. Only the smallest input
+        is materialized; posting lists are intersected into it and the
+        remaining ranges checked on the surviving rows, so the cost follows
+        the smallest input rather than the frame.
+        """
+        spans = {}
+        for col, (low, high) in (ranges or {}).items():
+            if low is None and high is None:
+                continue
+            if col not in self._range_values:
+                return self._all_rows[:0]
+            spans[col] = self.range_span(col, low, high)
+            if spans[col] == (0, self._n):
+                # Every row matches
+                del spans[col]
+
+        sets = sorted(sets, key=len)
+        driver = min(spans, key=lambda c: spans[c][1] - spans[c][0], default=None)
+        if driver is not None and (not sets or spans[driver][1] - spans[driver][0] < len(sets[0])):
+            lo, hi = spans.pop(driver)
+            if hi - lo < self._n // 4:
+                candidates = np.sort(self._range_rows[driver][lo:hi])
+            else:
+                # Most rows match: one linear pass beats sorting them
+                candidates = self.within_range(self._all_rows, driver, *ranges[driver])
+        elif sets:
+            candidates = sets.pop(0)
+        else:
+            return None
+
+        for rows in sets:
+            candidates = intersect_sorted(candidates, rows)
+        for col in spans:
+            candidates = self.within_range(candidates, col, *ranges[col])
+        return candidates
+
+    def facets(
+        self,
+        search: str = None,
+        position_group: str = None,
+        team: str = None,
+        ranges: dict = None
+    ) -> dict:
+        """Match counts per position group and per cleaned team name.
+
+        Each facet ignores its own filter, so a count is what selecting that
+        value would return. Both come from one bincount over integer codes
+        of the rows matching the remaining filters. Team counts are an
+        array aligned with ``team_labels``.
+        """
+        base = self._filter_rows([self.search_rows(search)] if search else [], ranges)
+        if base is None and not team and position_group in (None, "", "ALL"):
+            if self._unfiltered_facets is not None:
+                return self._unfiltered_facets
+        groups, teams, clean_teams = self._group_codes, self._team_codes, self._clean_team_codes
+        if base is not None:
+            groups, teams, clean_teams = groups[base], teams[base], clean_teams[base]
+
+        in_group = None
+        if position_group and position_group != "ALL":
+            code = self._group_labels.index(position_group) if position_group in self._group_labels else -2
+            in_group = groups == code
+        in_team = None
+        if team:
+            # Trailing False for rows without a team (code -1)
+            in_team = np.append(self._matching_teams(team), False)[teams]
+
+        group_counts = np.bincount(
+            groups if in_team is None else groups[in_team], minlength=len(self._group_labels)
+        )
+        if in_group is not None:
+            clean_teams = clean_teams[in_group]
+        team_counts = np.bincount(clean_teams, minlength=len(self.team_labels) + 1)[1:]
+
+        if in_group is None and in_team is None:
+            total = len(groups)
+        elif in_group is None:
+            total = int(np.count_nonzero(in_team))
+        elif in_team is None:
+            total = int(np.count_nonzero(in_group))
+        else:
+            total = int(np.count_nonzero(in_group & in_team))
+        return {
+            "total": total,
+            "positionGroup": dict(zip(self._group_labels, group_counts.tolist())),
+            "team": team_counts
+        }
+
+    def has_order(self, sort_col: str) -> bool:
+        return (sort_col, True) in self._orders
+
+    def seek(self, sort_col: str, ascending: bool, value, player_id) -> int:
+        """Rank of the first row ordered after ``(value, player_id)``.
+
+        The row itself need not exist any more, so a cursor taken before a
+        reload resumes at the same place in the new data.
+        """
+        key = (sort_col, ascending)
+        keys, uniques = self._keys[key], self._uniques[key]
+        if value is None:
+            k, exact = len(uniques) + 1, True
+        else:
+            code = int(np.searchsorted(uniques, value))
+            exact = code < len(uniques) and uniques[code] == value
+            if ascending:
+                k = code
+            else:
+                # Descending keys are negated codes; an absent value sorts
+                # just after the next-larger one
+                k = -code if exact else -(code - 1)
+        start = int(np.searchsorted(keys, k, side="left"))
+        if not exact:
+            return start
+        end = int(np.searchsorted(keys, k, side="right"))
+        tied = self._ordered_ids[key][start:end]
+        return start + int(np.searchsorted(tied, player_id, side="right"))
+
+    def select(
+        self,
+        start: int,
+        end: int,
+        search: str = None,
+        position_group: str = None,
+        team: str = None,
+        sort_col: str = None,
+        ascending: bool = False,
+        first_rank: int = 0,
+        ranges: dict = None
+    ) -> tuple[np.ndarray, int, bool]:
+        """Return the row positions of one page, the total match count and
+        whether more matches follow the page.
+
+        ``ranges`` maps range columns to inclusive ``(low, high)`` bounds,
+        either of which may be ``None``. ``start``/``end`` slice the matches
+        ordered at or after ``first_rank`` in the requested order.
+        """
+        sets = []
+        if search:
+            sets.append(self.search_rows(search))
+        if position_group and position_group != "ALL":
+            sets.append(self.position_rows(position_group))
+        if team:
+            sets.append(self.team_rows(team))
+        candidates = self._filter_rows(sets, ranges)
+
+        key = (sort_col, ascending)
+        if candidates is None:
+            order = self._orders.get(key, self._all_rows)[first_rank:]
+            return order[start:end], self._n, 0 <= start and end < len(order)
+
+        total = len(candidates)
+        if key not in self._orders:
+            return candidates[start:end], total, 0 <= start and end < total
+
+        ranks = self._ranks[key][candidates]
+        if first_rank:
+            ranks = ranks[ranks >= first_rank]
+        more = 0 <= start and end < len(ranks)
+        if 0 <= start < end < len(ranks):
+            # Only the first ``end`` ranks need ordering
+            ranks = np.sort(np.partition(ranks, end - 1)[:end])
+        else:
+            ranks = np.sort(ranks)
+        return self._orders[key][ranks[start:end]], total, more
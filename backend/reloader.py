@@ -0,0 +1,106 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DataReloader:
+    """Holds the live data service and replaces it when the data file changes.
+
+    New services are built on a background thread and published with a
+    single reference assignment, so a request that already fetched
+    ``current`` keeps using the old instance until it finishes. A change is
+    only picked up once the file has looked the same for two consecutive
+    polls, so a CSV still being written is never loaded. Files in
+    ``extra_paths`` are watched the same way.
+    """
+
+    def __init__(self, factory: Callable, watch_path: Path, interval: float = 30.0, extra_paths: tuple = ()):
+        self._factory = factory
+        self._watch_path = Path(watch_path)
+        # Changes to these also trigger a reload, e.g. a promoted model version
+        self._extra_paths = tuple(Path(p) for p in extra_paths)
+        self._interval = interval
+        self._build_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._force = False
+
+        self._stamp = self._read_stamp()
+        self._current = factory()
+
+    def _read_stamp(self) -> tuple | None:
+        stamp = file_stamp(self._watch_path)
+        if stamp is None:
+            return None
+        return (stamp, *(file_stamp(p) for p in self._extra_paths))
+
+    @property
+    def current(self):
+        return self._current
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild and swap in a new service; returns whether it swapped."""
+        with self._build_lock:
+            stamp = self._read_stamp()
+            if not force and stamp == self._stamp:
+                return False
+            try:
+                service = self._factory()
+            except Exception:
+                logger.exception("Reloading %s failed; keeping the current data", self._watch_path)
+                return False
+            self._current = service
+            self._stamp = stamp
+            logger.info("Swapped in data version %s", getattr(service, "version", None))
+            return True
+
+    def request_reload(self):
+        """Ask the watcher thread to rebuild now, even if the file is unchanged."""
+        self._force = True
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._watch, name="data-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        pending = None
+        while not self._stop.is_set():
+            # Without an interval only request_reload() wakes the thread
+            self._wake.wait(self._interval if self._interval > 0 else None)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._force:
+                self._force = False
+                self.reload(force=True)
+                continue
+            stamp = self._read_stamp()
+            if stamp is None or stamp == self._stamp:
+                pending = None
+            elif stamp == pending:
+                self.reload()
+                pending = None
+            else:
+                pending = stamp
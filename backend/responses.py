@@ -0,0 +1,133 @@
+"""Opt-in fast JSON path and response compression.
+
+With ``FAST_JSON=1`` endpoints return payloads the data service has already
+typed as pre-encoded bytes, skipping FastAPI's response-model validation;
+the models still document the schema in OpenAPI. ``orjson`` is used when it
+is installed. ``RESPONSE_COMPRESSION=1`` compresses large responses with
+brotli (if installed) or gzip, following ``Accept-Encoding``.
+"""
+import gzip
+import json
+import os
+
+from fastapi.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+FAST_JSON = os.environ.get("FAST_JSON") == "1"
+RESPONSE_COMPRESSION = os.environ.get("RESPONSE_COMPRESSION") == "1"
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def fast_response(payload):
+    """``payload`` as pre-encoded JSON when the fast path is on, else as-is.
+
+    Only pass payloads that already match the endpoint's response model.
+    """
+    if FAST_JSON:
+        return FastJSONResponse(payload)
+    return payload
+
+
+def encode(payload, model) -> bytes:
+    """JSON bytes for ``payload``, validated against ``model`` unless the fast path is on."""
+    if FAST_JSON:
+        return dumps(payload)
+    return model.model_validate(payload).model_dump_json().encode()
+
+
+def _encoding_for(accept_encoding: str) -> str | None:
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Brotli/gzip for complete response bodies above ``minimum_size``.
+
+    Compressed responses get a weak ETag, since the bytes differ from the
+    identity representation; ``If-None-Match`` comparison is weak anyway.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _encoding_for(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks = []
+
+        async def send_compressed(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(scope=start)
+            if (
+                start["status"] == 200
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+            ):
+                if encoding == "br":
+                    body = brotli.compress(body, quality=self.level)
+                else:
+                    body = gzip.compress(body, compresslevel=self.level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class _Flight:
+    """One in-progress computation that other callers can wait on."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+
+    def resolve(self, value=None, error: BaseException | None = None):
+        self._value = value
+        self._error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class ResultCache:
+    """Thread-safe LRU/TTL cache with single-flight misses.
+
+    Entries belong to one dataset version: the first call with a newer
+    version drops everything cached for older ones, and calls still
+    carrying an older version compute without touching the cache, so
+    versions must only grow (``PlayerDataService.version`` does).
+    Concurrent misses on the same key run ``compute`` once; the other
+    callers wait for its result.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable, version: int = 0):
+        now = time.monotonic()
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._entries.clear()
+                self._version = version
+            if version < self._version:
+                self.misses += 1
+                leader = None
+            else:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                flight = self._inflight.get(key)
+                if flight is not None:
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    flight = self._inflight[key] = _Flight()
+                    self.misses += 1
+                    leader = True
+
+        if leader is None:
+            return compute()
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.resolve(error=exc)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if version == self._version:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        flight.resolve(value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "version": self._version
+            }
@@ -0,0 +1,113 @@
+"""Nearest-neighbour index over per-90, standardized player stat vectors.
+
+Count stats are scaled to per-90 rates (percentages and ratios are left
+as they are), standardized across all players and L2-normalized, so the
+dot product of two rows is the exact cosine similarity of their
+standardized stats. Rows are stored grouped by position group: a
+same-position query scores one contiguous block, an unrestricted query
+the whole matrix.
+"""
+import numpy as np
+import pandas as pd
+
+from percentiles import COLUMN_GROUPS
+
+
+# Stat families the vectors are built from, alongside the radar skills
+SIMILARITY_GROUPS = [
+    "attacking_output", "chance_creation", "passing_buildup", "dribbling_carrying",
+    "defensive_actions", "duels_physical", "goalkeeping"
+]
+
+# Rate-like stats, compared as they are rather than per 90 minutes
+RATE_SUFFIXES = ("Percentage", "Conversion", "Frequency")
+
+# Players with fewer minutes are scaled as if they had played this many,
+# so a handful of minutes cannot produce extreme per-90 rates
+MIN_MINUTES = 90.0
+
+# Standardized values are clipped to this many standard deviations
+Z_CLIP = 5.0
+
+# Top-k candidates come from scores above the k-th best of every
+# SAMPLE_STRIDE-th row, which is never below the true k-th best
+SAMPLE_STRIDE = 64
+
+
+def similarity_columns(df: pd.DataFrame, radar_skills: dict) -> list[str]:
+    columns = [c for cols in radar_skills.values() for c in cols]
+    columns += [c for group in SIMILARITY_GROUPS for c in COLUMN_GROUPS[group]]
+    return [
+        c for c in dict.fromkeys(columns)
+        if c in df.columns and pd.api.types.is_numeric_dtype(df[c].dtype)
+    ]
+
+
+def stat_vectors(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    """Unit-length float32 vectors, one row per player."""
+    if "minutesPlayed" in df.columns:
+        minutes = pd.to_numeric(df["minutesPlayed"], errors="coerce").to_numpy(np.float64)
+    else:
+        minutes = np.full(len(df), MIN_MINUTES)
+    per90 = 90.0 / np.fmax(np.nan_to_num(minutes), MIN_MINUTES)
+
+    vectors = np.empty((len(df), len(columns)), dtype=np.float32)
+    for j, col in enumerate(columns):
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64)
+        if not col.endswith(RATE_SUFFIXES):
+            values = values * per90
+        mean = np.nanmean(values) if np.isfinite(values).any() else 0.0
+        std = np.nanstd(values) if np.isfinite(values).any() else 0.0
+        z = (values - mean) / std if std > 0 else np.zeros_like(values)
+        # Missing values sit at the mean
+        vectors[:, j] = np.clip(np.nan_to_num(z), -Z_CLIP, Z_CLIP)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+
+class SimilarityIndex:
+    """Cosine top-k over stat vectors, optionally within the position group."""
+
+    def __init__(self, df: pd.DataFrame, radar_skills: dict, group_col: str = "positionGroup"):
+        self.columns = similarity_columns(df, radar_skills)
+        codes, _ = pd.factorize(df[group_col])
+        by_group = np.argsort(codes, kind="stable")
+        self._rows = by_group
+        self._vectors = stat_vectors(df, self.columns)[by_group]
+
+        # Row -> slot in the grouped matrix, and the slot range of each group
+        self._slot = np.empty(len(df), dtype=np.intp)
+        self._slot[by_group] = np.arange(len(df))
+        sorted_codes = codes[by_group]
+        self._group_of = codes
+        self._group_bounds = np.searchsorted(sorted_codes, np.arange(codes.max(initial=-1) + 2))
+
+    def neighbours(self, pos: int, k: int = 10, same_group: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Row positions of the ``k`` most similar players to row ``pos``, and their similarity."""
+        slot = self._slot[pos]
+        lo, hi = 0, len(self._rows)
+        if same_group:
+            group = self._group_of[pos]
+            lo, hi = self._group_bounds[group], self._group_bounds[group + 1]
+        query = self._vectors[slot]
+
+        scores = self._vectors[lo:hi] @ query
+        if lo <= slot < hi:
+            scores[slot - lo] = -np.inf
+        k = min(k, hi - lo - (lo <= slot < hi))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+        # Narrow to the scores that can be in the top k before partitioning
+        sample = scores[::SAMPLE_STRIDE]
+        if len(sample) > k:
+            threshold = np.partition(sample, len(sample) - k)[len(sample) - k]
+            candidates = np.flatnonzero(scores >= threshold)
+        else:
+            candidates = np.arange(len(scores))
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+        best = candidates[order]
+        return self._rows[best + lo], scores[best]
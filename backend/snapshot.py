@@ -0,0 +1,226 @@
+"""Typed columnar snapshot of the prepared player table.
+
+The snapshot is a directory holding one ``.npy`` file per column plus a
+``manifest.json``. Numeric columns are memory-mapped on load, so startup
+skips CSV parsing and the radar percentile pass, and pages are shared with
+the OS page cache instead of copied into every process. Arrays derived
+from the frame (e.g. the stat percentile matrices) can be stored with it
+and are mapped the same way.
+
+Build it next to the CSV with::
+
+    python snapshot.py [path/to/cleaned_player_data.csv]
+
+or let the first worker build it on demand with ``ensure_snapshot``; with
+the directory on tmpfs (e.g. ``/dev/shm``) every worker maps the same
+physical pages. A fresh snapshot next to the CSV (e.g. one baked into an
+image) is copied there instead of rebuilt.
+"""
+import fcntl
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from predictions import PREDICTION_COLUMN, PREDICTION_PREFIX
+
+
+SNAPSHOT_VERSION = 1
+
+# Low-cardinality text kept as pandas categoricals after loading
+CATEGORY_COLUMNS = [
+    "teamName", "position", "positionGroup", "firstSidePosition",
+    "secondSidePosition", "preferredFoot", "MarketValueCurrency"
+]
+
+# Float columns kept at full precision, with every per-model prediction
+# (PREDICTION_PREFIX + name); every other float column is float32
+FLOAT64_COLUMNS = ["playerId", "MarketValueCurrent", "MarketValuePrevious", PREDICTION_COLUMN]
+
+
+def _keeps_float64(col: str) -> bool:
+    return col in FLOAT64_COLUMNS or col.startswith(PREDICTION_PREFIX)
+
+
+class Snapshot(NamedTuple):
+    frame: pd.DataFrame
+    # Derived arrays stored with the frame, by name
+    arrays: dict[str, np.ndarray]
+
+
+def snapshot_path_for(data_path: str | Path, snapshot_dir: str | Path | None = None) -> Path:
+    data_path = Path(data_path)
+    if snapshot_dir is None:
+        return data_path.with_suffix(".snapshot")
+    return Path(snapshot_dir) / (data_path.stem + ".snapshot")
+
+
+def _source_stamp(data_path: Path) -> dict:
+    stat = data_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_snapshot(
+    df: pd.DataFrame,
+    path: str | Path,
+    data_path: str | Path | None = None,
+    arrays: dict[str, np.ndarray] | None = None
+) -> Path:
+    """Write ``df`` and ``arrays`` as a snapshot directory, replacing any existing one."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col, "file": f"{i}.npy"}
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            cat = pd.Categorical(series)
+            entry["kind"] = "category" if col in CATEGORY_COLUMNS else "text"
+            entry["categories"] = cat.categories.tolist()
+            values = cat.codes
+        elif pd.api.types.is_float_dtype(series.dtype):
+            entry["kind"] = "numeric"
+            values = series.to_numpy(np.float64 if _keeps_float64(col) else np.float32)
+        else:
+            entry["kind"] = "numeric"
+            values = series.to_numpy()
+        np.save(tmp / entry["file"], np.ascontiguousarray(values))
+        columns.append(entry)
+
+    stored = []
+    for name, values in (arrays or {}).items():
+        entry = {"name": name, "file": f"array_{len(stored)}.npy"}
+        np.save(tmp / entry["file"], np.ascontiguousarray(values))
+        stored.append(entry)
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "rows": len(df),
+        "source": _source_stamp(Path(data_path)) if data_path else None,
+        "columns": columns,
+        "arrays": stored,
+        # Frame metadata such as the model version behind stored predictions
+        "attrs": dict(df.attrs)
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest))
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+def read_snapshot(path: str | Path) -> Snapshot:
+    """Load a snapshot; numeric columns and arrays stay memory-mapped and read-only."""
+    path = Path(path)
+    manifest = json.loads((path / "manifest.json").read_text())
+    if manifest["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {manifest['version']} in {path}")
+
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(path / entry["file"], mmap_mode="r")
+        if entry["kind"] == "category":
+            data[entry["name"]] = pd.Categorical.from_codes(np.asarray(values), entry["categories"])
+        elif entry["kind"] == "text":
+            # Code -1 (missing) picks the trailing NaN
+            lookup = np.array(entry["categories"] + [np.nan], dtype=object)
+            data[entry["name"]] = lookup[values]
+        else:
+            data[entry["name"]] = values
+    df = pd.DataFrame(data, copy=False)
+    df.attrs.update(manifest.get("attrs") or {})
+    arrays = {
+        entry["name"]: np.load(path / entry["file"], mmap_mode="r")
+        for entry in manifest.get("arrays", [])
+    }
+    return Snapshot(df, arrays)
+
+
+def snapshot_is_fresh(path: str | Path, data_path: str | Path) -> bool:
+    """Whether ``path`` holds a snapshot built from the current ``data_path``.
+
+    Without the CSV any existing snapshot counts as fresh.
+    """
+    manifest_path = Path(path) / "manifest.json"
+    if not manifest_path.exists():
+        return False
+    data_path = Path(data_path)
+    if not data_path.exists():
+        return True
+    return json.loads(manifest_path.read_text()).get("source") == _source_stamp(data_path)
+
+
+def load_snapshot(data_path: str | Path, path: str | Path | None = None) -> Snapshot | None:
+    """Load the snapshot for ``data_path`` unless it is missing or stale."""
+    path = Path(path) if path else snapshot_path_for(data_path)
+    if not snapshot_is_fresh(path, data_path):
+        return None
+    return read_snapshot(path)
+
+
+def source_version(data_path: str | Path, path: str | Path | None = None) -> int:
+    """``mtime_ns`` of the CSV, or of the CSV the snapshot was built from."""
+    data_path = Path(data_path)
+    if data_path.exists():
+        return _source_stamp(data_path)["mtime_ns"]
+    manifest_path = (Path(path) if path else snapshot_path_for(data_path)) / "manifest.json"
+    if manifest_path.exists():
+        source = json.loads(manifest_path.read_text()).get("source")
+        if source:
+            return source["mtime_ns"]
+    return 0
+
+
+def _copy_snapshot(source: Path, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    shutil.copytree(source, tmp)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+def ensure_snapshot(
+    data_path: str | Path,
+    build: Callable[[], Snapshot],
+    path: str | Path | None = None
+) -> Snapshot:
+    """Map the snapshot at ``path``, building it first if it is stale.
+
+    Processes sharing ``path`` serialize on a lock file next to it: the first
+    one finds it stale and writes it, the rest find it fresh and only map it.
+    Nobody maps a half-written snapshot. A fresh snapshot next to the CSV is
+    copied to ``path``; only without one is ``build()`` called.
+    """
+    path = Path(path) if path else snapshot_path_for(data_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if not snapshot_is_fresh(path, data_path):
+                seed = snapshot_path_for(data_path)
+                if seed != path and snapshot_is_fresh(seed, data_path):
+                    _copy_snapshot(seed, path)
+                else:
+                    df, arrays = build()
+                    write_snapshot(df, path, data_path, arrays)
+            return read_snapshot(path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+if __name__ == "__main__":
+    from data_service import PlayerDataService
+
+    service = PlayerDataService(sys.argv[1] if len(sys.argv) > 1 else None, use_snapshot=False)
+    out = write_snapshot(
+        service._df, snapshot_path_for(service.data_path), service.data_path, service.snapshot_arrays()
+    )
+    print(f"Wrote {len(service._df):,} players to {out}")
@@ -0,0 +1,156 @@
+"""What-if valuations: a player's predicted value as one input varies.
+
+The perturbed records of a request are turned into one feature matrix
+with the single-row path of the feature pipeline, and concurrent requests
+are micro-batched, so the ensemble runs one ``predict`` per model over
+the grid points of every request that arrived within
+``WHATIF_BATCH_WINDOW_MS``.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from predictions import EnsemblePredictor, FeaturePipeline
+
+
+# API name -> input column that is varied
+WHATIF_FEATURES = {
+    "minutesPlayed": "minutesPlayed",
+    "age": "age",
+    "goalsPer90": "goals"
+}
+
+MAX_WHATIF_POINTS = 50
+
+# How long the first request of a batch waits for others to join
+BATCH_WINDOW = float(os.environ.get("WHATIF_BATCH_WINDOW_MS", "2")) / 1000
+
+
+def parse_grid(text: str) -> list[float]:
+    """Grid values from a comma-separated list."""
+    try:
+        values = [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError("values must be a comma-separated list of numbers")
+    if not values:
+        raise ValueError("values must not be empty")
+    if len(values) > MAX_WHATIF_POINTS:
+        raise ValueError(f"At most {MAX_WHATIF_POINTS} values are allowed")
+    if not all(math.isfinite(v) and v >= 0 for v in values):
+        raise ValueError("values must be finite and non-negative")
+    return values
+
+
+def _number(record: dict, column: str) -> float | None:
+    value = pd.to_numeric(record.get(column), errors="coerce")
+    return None if pd.isna(value) else float(value)
+
+
+def current_value(record: dict, feature: str) -> float | None:
+    if feature == "goalsPer90":
+        goals, minutes = _number(record, "goals"), _number(record, "minutesPlayed")
+        if goals is None or minutes is None or minutes <= 0:
+            return None
+        return goals / minutes * 90
+    return _number(record, WHATIF_FEATURES[feature])
+
+
+def perturbed_records(record: dict, feature: str, values: list[float]) -> list[dict]:
+    """Copies of ``record`` with ``feature`` set to each of ``values``.
+
+    Goals per 90 is moved through ``goals`` at the player's minutes, so
+    every feature derived from goals stays consistent with it.
+    """
+    column = WHATIF_FEATURES[feature]
+    if feature == "goalsPer90":
+        minutes = _number(record, "minutesPlayed")
+        if minutes is None or minutes <= 0:
+            raise ValueError("Goals per 90 cannot be varied for a player without minutes")
+        return [{**record, column: v * minutes / 90} for v in values]
+    return [{**record, column: v} for v in values]
+
+
+class MicroBatcher:
+    """Coalesce concurrent calls into one call of ``fn`` on the stacked rows.
+
+    The first caller to find the queue empty waits ``window`` seconds for
+    others to join, then runs ``fn`` once and hands every caller its slice
+    of each output array. One batch runs at a time; calls arriving while
+    it runs queue up for the next one.
+    """
+
+    def __init__(self, fn: Callable[[np.ndarray], dict], window: float = BATCH_WINDOW):
+        self._fn = fn
+        self._window = window
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._pending = []
+        self.batches = 0
+        self.rows = 0
+
+    def __call__(self, rows: np.ndarray) -> dict[str, np.ndarray]:
+        future = Future()
+        with self._lock:
+            leader = not self._pending
+            self._pending.append((rows, future))
+        if leader:
+            if self._window > 0:
+                time.sleep(self._window)
+            with self._run_lock:
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                self._run(batch)
+        return future.result()
+
+    def _run(self, batch: list):
+        try:
+            outputs = self._fn(np.vstack([rows for rows, _ in batch]))
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        start = 0
+        for rows, future in batch:
+            end = start + len(rows)
+            future.set_result({name: values[start:end] for name, values in outputs.items()})
+            start = end
+        self.rows += start
+
+
+class WhatIfScorer:
+    """Score perturbed copies of a player record with the ensemble."""
+
+    def __init__(self, ensemble: EnsemblePredictor, pipeline: FeaturePipeline, window: float = BATCH_WINDOW):
+        self.ensemble = ensemble
+        self.pipeline = pipeline
+        self._batcher = MicroBatcher(self._predict, window)
+
+    def _predict(self, matrix: np.ndarray) -> dict[str, np.ndarray]:
+        features = pd.DataFrame(matrix, columns=self.pipeline.feature_columns)
+        return self.ensemble.predict_all(features)
+
+    def valuations(self, record: dict, feature: str, values: list[float]) -> list[dict]:
+        """Per-model and combined predicted value at every grid value."""
+        records = perturbed_records(record, feature, values)
+        matrix = np.array([self.pipeline.transform_row(r) for r in records], dtype=np.float64)
+        deltas = self._batcher(matrix)
+
+        previous = pd.to_numeric(record.get("MarketValuePrevious"), errors="coerce")
+        previous_log = math.log1p(0.0 if pd.isna(previous) else float(previous))
+        predicted = {name: np.expm1(previous_log + delta) for name, delta in deltas.items()}
+        combined = np.expm1(previous_log + self.ensemble.combine(deltas))
+        return [
+            {
+                "value": value,
+                "predictedValue": float(combined[i]),
+                "predictedValues": {name: float(p[i]) for name, p in predicted.items()}
+            }
+            for i, value in enumerate(values)
+        ]
@@ -0,0 +1,45 @@
+"""Compare page-number and cursor paging through /api/players results.
+
+Usage: python benchmarks/bench_deep_paging.py [n_players]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+
+
+def page_cost(service: PlayerDataService, depth: int, limit: int, **filters) -> tuple[float, float]:
+    """Microseconds for page ``depth`` by page number and by cursor."""
+    _, _, cursor = service.get_players(page=depth - 1, limit=limit, **filters)
+    repeats = 50
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        by_page, _, _ = service.get_players(page=depth, limit=limit, **filters)
+    offset = (time.perf_counter() - start) / repeats * 1e6
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        by_cursor, _, _ = service.get_players(cursor=cursor, limit=limit, **filters)
+    keyset = (time.perf_counter() - start) / repeats * 1e6
+
+    assert by_page == by_cursor
+    return offset, keyset
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PlayerDataService(write_players_csv(n, Path(tmp) / "players.csv"))
+
+    limit = 50
+    print(f"players: {n:,}, limit {limit}")
+    for label, filters in [("all", {}), ("MID, by rating", {"position_group": "MID", "sort_by": "rating"})]:
+        _, total, _ = service.get_players(limit=limit, **filters)
+        pages = (total + limit - 1) // limit
+        for depth in (2, pages // 10, pages - 1):
+            offset, keyset = page_cost(service, depth, limit, **filters)
+            print(f"  {label:15s} page {depth:5d}: page number {offset:8.1f} us, cursor {keyset:8.1f} us")
@@ -0,0 +1,55 @@
+"""Time the model ensemble at batch sizes from 1 to 100k rows: members one after another vs on the thread pool.
+
+Needs the checkpoints in models/checkpoints and their model libraries.
+
+Usage: python benchmarks/bench_ensemble.py [max_rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from synthetic import make_players
+from feature_pipeline import FeaturePipeline
+from predictions import default_model_dir, get_ensemble
+from ensemble import EnsemblePredictor
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    loaded = get_ensemble(default_model_dir())
+    if not loaded:
+        sys.exit("No checkpoints loaded; nothing to benchmark")
+    df = make_players(max_rows)
+    features = FeaturePipeline().fit(df).transform(df)
+
+    serial = EnsemblePredictor(loaded.models, parallel_min_rows=sys.maxsize)
+    parallel = EnsemblePredictor(loaded.models, parallel_min_rows=1)
+    print(f"models: {', '.join(loaded.models)}")
+    print(f"{'rows':>8s} {'serial':>10s} {'parallel':>10s} {'default':>10s}   slowest member")
+    for rows in [1, 10, 100, 1_000, 10_000, 100_000]:
+        if rows > max_rows:
+            break
+        X = features.iloc[:rows]
+        repeats = 20 if rows <= 1_000 else 3
+        serial.predict(X)
+        parallel.predict(X)
+        t_serial = best_of(lambda: serial.predict(X), repeats)
+        t_parallel = best_of(lambda: parallel.predict(X), repeats)
+        t_default = best_of(lambda: loaded.predict(X), repeats)
+        slowest = max(parallel.timing_stats().items(), key=lambda item: item[1]["lastMs"])
+        print(
+            f"{rows:8,d} {t_serial * 1e3:8.2f}ms {t_parallel * 1e3:8.2f}ms {t_default * 1e3:8.2f}ms"
+            f"   {slowest[0]} {slowest[1]['lastMs']:.2f}ms"
+        )
+    for e in (serial, parallel):
+        e.close()
@@ -0,0 +1,45 @@
+"""Time the feature pipeline: batch transform for training, single rows for online scoring.
+
+Usage: python benchmarks/bench_feature_pipeline.py [n_players]
+"""
+import sys
+import time
+
+import numpy as np
+
+from synthetic import make_players
+from feature_pipeline import FeaturePipeline
+
+
+def timed(fn, args) -> np.ndarray:
+    times = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1e6
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = make_players(n)
+    pipeline = FeaturePipeline().fit(df)
+
+    start = time.perf_counter()
+    batch = pipeline.transform(df)
+    elapsed = time.perf_counter() - start
+
+    records = df.sample(min(n, 2000), random_state=0).to_dict("records")
+    positions = [df.index.get_loc(i) for i in df.sample(min(n, 2000), random_state=0).index]
+    rows = np.array([pipeline.transform_row(r) for r in records])
+    assert np.array_equal(rows, batch.to_numpy()[positions])
+
+    print(f"players: {n:,}, features: {len(pipeline.feature_columns)}")
+    print(f"  batch transform  {elapsed * 1e3:8.1f} ms ({elapsed / n * 1e6:.2f} us/row)")
+    frames = [df.iloc[[p]] for p in positions[:300]]
+    for label, fn, args in [
+        ("batch of one", pipeline.transform, frames),
+        ("transform_row", pipeline.transform_row, records)
+    ]:
+        times = timed(fn, args)
+        print(f"  {label:15s} median {np.median(times):8.1f} us, p99 {np.percentile(times, 99):8.1f} us")
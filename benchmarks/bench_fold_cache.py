@@ -0,0 +1,60 @@
+"""Time tuning trials on one CV fold: binned datasets rebuilt for every trial vs cached per fold.
+
+Trials are sampled from the models_training.py grids and run at the first
+rung's round budget, where building the datasets weighs the most.
+
+Usage: python benchmarks/bench_fold_cache.py [rows] [trials]
+"""
+import sys
+import time
+
+import numpy as np
+from sklearn.model_selection import KFold, ParameterSampler
+
+from synthetic import ROOT, make_players
+from feature_pipeline import FeaturePipeline
+
+sys.path.insert(0, str(ROOT / "models"))
+from tuning import BACKENDS, SuccessiveHalvingSearch
+from models_training import SEARCHES
+
+PATIENCE = 50
+
+
+def run(backend, trials: list[dict], rounds: int, train: tuple, valid: tuple, cache: dict | None) -> float:
+    start = time.perf_counter()
+    for params in trials:
+        key = backend.binning(params)
+        if cache is None or key not in cache:
+            datasets = backend.datasets(train, valid, params, 1)
+            if cache is not None:
+                cache[key] = datasets
+        else:
+            datasets = cache[key]
+        backend.train(params, rounds, datasets, PATIENCE, 1)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_trials = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    df = make_players(rows)
+    X = FeaturePipeline().fit(df).transform(df).to_numpy(np.float64)
+    y = np.log1p(df["MarketValueCurrent"].to_numpy()) - np.log1p(df["MarketValuePrevious"].to_numpy())
+    train_idx, valid_idx = next(KFold(n_splits=5).split(X))
+    train, valid = (X[train_idx], y[train_idx]), (X[valid_idx], y[valid_idx])
+
+    print(f"{rows:,} rows x {X.shape[1]} features, {n_trials} trials per library")
+    print(f"{'library':10s} {'rounds':>6s} {'rebuilt':>12s} {'cached':>12s} {'speedup':>8s}")
+    for name, (_, grid) in SEARCHES.items():
+        backend = BACKENDS[name]()
+        search = SuccessiveHalvingSearch(backend, grid)
+        rounds = search.rungs()[0]
+        trials = list(ParameterSampler(search.param_grid, n_trials, random_state=42))
+        run(backend, trials[:1], rounds, train, valid, None)
+        rebuilt = run(backend, trials, rounds, train, valid, None)
+        cached = run(backend, trials, rounds, train, valid, {})
+        print(
+            f"{name:10s} {rounds:6d} {rebuilt / n_trials * 1e3:9.1f} ms {cached / n_trials * 1e3:9.1f} ms"
+            f" {rebuilt / cached:7.2f}x"
+        )
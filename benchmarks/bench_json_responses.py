@@ -0,0 +1,61 @@
+"""Per-endpoint latency with and without the FAST_JSON response path.
+
+Requests go through the full ASGI stack with Starlette's TestClient; the
+/api/players result cache is disabled so every request serializes a page.
+Usage: python benchmarks/bench_json_responses.py [n_players]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["PLAYER_RELOAD_INTERVAL"] = "0"
+
+from synthetic import write_players_csv
+import data_service
+import responses
+
+from fastapi.testclient import TestClient
+
+
+def timed(client: TestClient, urls: list[str]) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        client.get(url)
+    return (time.perf_counter() - start) / len(urls) * 1e3
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    tmp = tempfile.TemporaryDirectory()
+    csv = write_players_csv(n, Path(tmp.name) / "players.csv")
+    data_service.default_data_path = lambda: csv
+
+    import main
+    main.players_cache.maxsize = 0
+
+    with TestClient(main.app) as client:
+        ids = main.get_data_service()._df["playerId"].to_numpy()[:200].tolist()
+        endpoints = {
+            "/api/players?limit=100": [f"/api/players?limit=100&page={p}" for p in range(1, 101)],
+            "/api/players/{id}": [f"/api/players/{pid}" for pid in ids],
+            "/api/players/{id}/radar": [f"/api/players/{pid}/radar" for pid in ids],
+            "/api/teams": ["/api/teams"] * 50
+        }
+        for urls in endpoints.values():
+            for url in urls[:3]:
+                responses.FAST_JSON = False
+                slow = json.loads(client.get(url).content)
+                responses.FAST_JSON = True
+                assert json.loads(client.get(url).content) == slow, url
+
+        print(f"players: {n:,}, encoder: {'orjson' if responses.orjson else 'json'}")
+        for name, urls in endpoints.items():
+            responses.FAST_JSON = False
+            validated = timed(client, urls)
+            responses.FAST_JSON = True
+            fast = timed(client, urls)
+            print(f"  {name:26s} validated {validated:7.3f} ms   fast {fast:7.3f} ms   ({validated / fast:.1f}x)")
+    tmp.cleanup()
@@ -0,0 +1,66 @@
+"""Compare iterrows page serialization with the precomputed column path.
+
+Usage: python benchmarks/bench_page_serialization.py [n_players]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+from predictions import PREDICTION_COLUMN
+
+
+def iterrows_page(df_page: pd.DataFrame) -> list[dict]:
+    # The per-row conversion get_players used before summary columns
+    players = []
+    for _, row in df_page.iterrows():
+        players.append({
+            "playerId": int(row.get("playerId", 0)),
+            "name": str(row.get("name", row.get("player_name", "Unknown"))),
+            "teamName": str(row.get("teamName", "Unknown")).split(" ~ ")[0],
+            "position": str(row.get("position", "Unknown")),
+            "positionGroup": str(row.get("positionGroup", "UNK")),
+            "age": float(row["age"]) if pd.notna(row.get("age")) else None,
+            "marketValue": float(row["MarketValueCurrent"]) if pd.notna(row.get("MarketValueCurrent")) else None,
+            "marketValueCurrency": str(row.get("MarketValueCurrency", "EUR")),
+            "rating": float(row["rating"]) if pd.notna(row.get("rating")) else None,
+            "appearances": int(row["appearances"]) if pd.notna(row.get("appearances")) else None,
+            "predictedValue": float(row[PREDICTION_COLUMN]) if pd.notna(row.get(PREDICTION_COLUMN)) else None
+        })
+    return players
+
+
+def column_page(service: PlayerDataService, rows: np.ndarray) -> list[dict]:
+    fields = list(service._summary_columns)
+    columns = [service._summary_columns[f][rows] for f in fields]
+    return [dict(zip(fields, record)) for record in zip(*columns)]
+
+
+def timed(fn, pages) -> float:
+    start = time.perf_counter()
+    for rows in pages:
+        fn(rows)
+    return (time.perf_counter() - start) / len(pages) * 1e3
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    limit = 100
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PlayerDataService(write_players_csv(n, Path(tmp) / "players.csv"))
+
+    rng = np.random.default_rng(0)
+    pages = [rng.choice(n, limit, replace=False) for _ in range(200)]
+    assert all(iterrows_page(service._df.iloc[rows]) == column_page(service, rows) for rows in pages[:20])
+
+    old = timed(lambda rows: iterrows_page(service._df.iloc[rows]), pages)
+    new = timed(lambda rows: column_page(service, rows), pages)
+
+    print(f"players: {n:,}, page size: {limit}")
+    print(f"  iterrows:       {old:8.3f} ms/page")
+    print(f"  column arrays:  {new:8.3f} ms/page  ({old / new:.0f}x)")
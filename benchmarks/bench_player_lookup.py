@@ -0,0 +1,51 @@
+"""Compare the boolean-scan player lookup with the playerId index and detail cache.
+
+Usage: python benchmarks/bench_player_lookup.py [n_players]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+
+
+def scan_lookup(service: PlayerDataService, player_id: int) -> dict | None:
+    # The pre-index path: mask over the full frame, then build the payload
+    df = service._df[service._df["playerId"] == player_id]
+    if df.empty:
+        return None
+    return service._build_player_detail(df.iloc[0])
+
+
+def timed(fn, ids) -> float:
+    start = time.perf_counter()
+    for pid in ids:
+        fn(pid)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PlayerDataService(write_players_csv(n, Path(tmp) / "players.csv"))
+
+    rng = np.random.default_rng(0)
+    ids = rng.choice(service._df["playerId"].to_numpy(), 2000).tolist()
+
+    assert all(scan_lookup(service, pid) == service.get_player_by_id(pid) for pid in ids[:50])
+    service._detail_cache.cache_clear()
+
+    scan = timed(lambda pid: scan_lookup(service, pid), ids[:200])
+    cold = timed(service.get_player_by_id, ids)
+    warm = timed(service.get_player_by_id, ids)
+    radar = timed(service.get_radar_data, ids)
+
+    print(f"players: {n:,}")
+    print(f"  scan + build:        {scan:10.1f} us/lookup")
+    print(f"  index + build (miss):{cold:10.1f} us/lookup")
+    print(f"  index + cache (hit): {warm:10.1f} us/lookup")
+    print(f"  radar (hit):         {radar:10.1f} us/lookup")
@@ -0,0 +1,65 @@
+"""Compare boolean-mask range filtering with the sorted range indexes.
+
+Usage: python benchmarks/bench_range_filters.py [n_players]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+
+
+CASES = [
+    ("narrow", {"min_age": 34, "min_value": 5e7}),
+    ("medium", {"min_age": 24, "max_age": 27, "min_rating": 7.0}),
+    ("wide", {"min_minutes": 90})
+]
+
+
+def mask_filter(service: PlayerDataService, min_age=None, max_age=None, min_value=None,
+                max_value=None, min_rating=None, min_minutes=None) -> int:
+    # The boolean-scan equivalent: one full-frame comparison per bound
+    df = service._df
+    mask = df["age"].notna()
+    if min_age is not None:
+        mask &= df["age"] >= min_age
+    if max_age is not None:
+        mask &= df["age"] <= max_age
+    if min_value is not None:
+        mask &= df["MarketValueCurrent"] >= min_value
+    if max_value is not None:
+        mask &= df["MarketValueCurrent"] <= max_value
+    if min_rating is not None:
+        mask &= df["rating"] >= min_rating
+    if min_minutes is not None:
+        mask &= df["minutesPlayed"] >= min_minutes
+    return int(mask.sum())
+
+
+def timed(fn, repeats: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PlayerDataService(write_players_csv(n, Path(tmp) / "players.csv"))
+
+    print(f"players: {n:,}")
+    for label, bounds in CASES:
+        _, total, _ = service.get_players(limit=50, **bounds)
+        scan = timed(lambda: mask_filter(service, **bounds))
+        indexed = timed(lambda: service._engine.select(
+            0, 50, sort_col="MarketValueCurrent", ranges={
+                "age": (bounds.get("min_age"), bounds.get("max_age")),
+                "MarketValueCurrent": (bounds.get("min_value"), bounds.get("max_value")),
+                "rating": (bounds.get("min_rating"), None),
+                "minutesPlayed": (bounds.get("min_minutes"), None)
+            }
+        ))
+        print(f"  {label:7s} ({total:7,} matches): mask {scan:8.1f} us, sorted index {indexed:8.1f} us")
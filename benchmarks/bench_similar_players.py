@@ -0,0 +1,57 @@
+"""Time /api/players/{id}/similar lookups against scoring and fully sorting every player.
+
+Usage: python benchmarks/bench_similar_players.py [n_players]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+
+
+def brute_force(service: PlayerDataService, player_id: int, k: int) -> list[int]:
+    # Every player scored against the query with no precomputed order
+    index = service._similarity
+    vectors = index._vectors[index._slot]
+    pos = service._id_index[player_id]
+    scores = vectors @ vectors[pos]
+    scores[pos] = -np.inf
+    best = np.argsort(-scores, kind="stable")[:k]
+    return service._df["playerId"].to_numpy()[best].astype(int).tolist()
+
+
+def timed(fn, ids) -> np.ndarray:
+    times = []
+    for pid in ids:
+        start = time.perf_counter()
+        fn(pid)
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1e3
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_players_csv(n, Path(tmp) / "players.csv")
+        start = time.perf_counter()
+        service = PlayerDataService(path)
+        load = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    ids = rng.choice(service._df["playerId"].to_numpy(), 300).astype(int).tolist()
+    for pid in ids[:20]:
+        got = [p["playerId"] for p in service.get_similar_players(pid, 10)]
+        assert got == brute_force(service, pid, 10)
+
+    print(f"players: {n:,} (service load {load:.2f} s, {service._similarity._vectors.shape[1]} dims)")
+    for label, fn in [
+        ("full sort", lambda pid: brute_force(service, pid, 10)),
+        ("all players", lambda pid: service.get_similar_players(pid, 10)),
+        ("same position", lambda pid: service.get_similar_players(pid, 10, same_position=True))
+    ]:
+        times = timed(fn, ids)
+        print(f"  {label:14s} median {np.median(times):6.2f} ms, p99 {np.percentile(times, 99):6.2f} ms")
@@ -0,0 +1,69 @@
+"""Compare loading the training split from CSV vs the memory-mapped binary copy.
+
+Each load runs in a fresh interpreter and reads X_train and y_train the way
+models_training.py does, converts X to the float64 matrix the model
+libraries train on and reads every value once (mapped pages are only read
+from disk when touched). Peak memory is the growth of the process's
+high-water RSS (``VmHWM``, Linux) over that step, so library imports are
+excluded; mapped pages count towards it, though they are shared with the
+page cache and other processes.
+
+Usage: python benchmarks/bench_split_format.py [rows]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from synthetic import ROOT, make_players
+from feature_pipeline import FeaturePipeline
+
+sys.path.insert(0, str(ROOT / "models"))
+from split_store import BINARY_DIR, write_split
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {models!r})
+import numpy as np
+from split_store import read_csv_table, read_table
+def hwm():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+base = hwm()
+start = time.perf_counter()
+X, y = {reader}({split!r}, 'X_train'), {reader}({split!r}, 'y_train')
+X = np.ascontiguousarray(X, dtype=np.float64)
+X.sum(), np.sum(y)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "peak_mb": (hwm() - base) / 1024}}))
+"""
+
+READERS = {"CSV": "read_csv_table", "npy, memory-mapped": "read_table"}
+
+
+def run(reader: str, split: Path) -> dict:
+    code = CHILD.format(models=str(ROOT / "models"), reader=reader, split=str(split))
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = make_players(rows)
+    X = FeaturePipeline().fit(df).transform(df)
+    y = (np.log1p(df["MarketValueCurrent"]) - np.log1p(df["MarketValuePrevious"])).rename("delta")
+    with tempfile.TemporaryDirectory() as split:
+        split = Path(split)
+        X.to_csv(split / "X_train.csv", index=False)
+        y.to_csv(split / "y_train.csv", index=False)
+        write_split({"X_train": X, "y_train": y}, split)
+
+        csv_mb = sum((split / f"{name}.csv").stat().st_size for name in ("X_train", "y_train")) / 1e6
+        npy_mb = sum(p.stat().st_size for p in (split / BINARY_DIR).glob("*.npy")) / 1e6
+        print(f"{rows:,} rows x {X.shape[1]} features (CSV {csv_mb:.0f} MB, npy {npy_mb:.0f} MB)")
+        for label, reader in READERS.items():
+            results = sorted((run(reader, split) for _ in range(3)), key=lambda r: r["seconds"])
+            print(f"  {label:20s} {results[1]['seconds'] * 1e3:8.1f} ms  peak +{results[1]['peak_mb']:6.1f} MB (median of 3)")
@@ -0,0 +1,54 @@
+"""Compare service startup time and RSS for the CSV and snapshot load paths.
+
+Each mode runs in a fresh interpreter so RSS is not shared between runs.
+Usage: python benchmarks/bench_startup.py [n_players]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+from snapshot import snapshot_path_for, write_snapshot
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {backend!r})
+from data_service import PlayerDataService
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+base = rss_mb()
+start = time.perf_counter()
+service = PlayerDataService({csv!r}, use_snapshot={use_snapshot})
+service.get_players(limit=50)
+print(json.dumps({{"seconds": time.perf_counter() - start, "rss_mb": rss_mb(), "delta_mb": rss_mb() - base}}))
+"""
+
+
+def run(csv: Path, use_snapshot: bool) -> dict:
+    backend = str(Path(__file__).resolve().parent.parent / "backend")
+    code = CHILD.format(backend=backend, csv=str(csv), use_snapshot=use_snapshot)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = write_players_csv(n, Path(tmp) / "players.csv")
+        service = PlayerDataService(csv, use_snapshot=False)
+        write_snapshot(service._df, snapshot_path_for(csv), csv, service.snapshot_arrays())
+        del service
+
+        print(f"players: {n:,}")
+        for label, use_snapshot in [("csv", False), ("snapshot", True)]:
+            r = run(csv, use_snapshot)
+            print(f"  {label:9s} startup {r['seconds']:6.2f} s   rss {r['rss_mb']:7.1f} MB   (+{r['delta_mb']:.1f} MB for data)")
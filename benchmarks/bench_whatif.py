@@ -0,0 +1,78 @@
+"""Time /api/players/{id}/whatif grids: per-point predicts, one grid predict, and concurrent micro-batching.
+
+Needs the checkpoints in models/checkpoints and their model libraries.
+
+Usage: python benchmarks/bench_whatif.py [n_players] [concurrent_requests]
+"""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from synthetic import write_players_csv
+from data_service import PlayerDataService
+from whatif import WhatIfScorer, perturbed_records
+
+AGES = [18, 20, 22, 24, 26, 28, 30, 32, 34, 36]
+
+
+def per_point(scorer: WhatIfScorer, record: dict):
+    # One predict call per model and grid point
+    for r in perturbed_records(record, "age", AGES):
+        row = pd.DataFrame([scorer.pipeline.transform_row(r)], columns=scorer.pipeline.feature_columns)
+        scorer.ensemble.predict_all(row)
+
+
+def concurrent(service: PlayerDataService, ids: list[int], threads: int) -> float:
+    chunks = [ids[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        for pid in chunk:
+            service.get_whatif(pid, "age", AGES)
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_players_csv(n, Path(tmp) / "players.csv")
+        service = PlayerDataService(path, use_snapshot=False)
+    if not service.predictions_available:
+        sys.exit("No checkpoints loaded; nothing to benchmark")
+    scorer = service._whatif
+
+    rng = np.random.default_rng(0)
+    ids = rng.choice(service._df["playerId"].to_numpy(), 200).astype(int).tolist()
+    records = [service._df.iloc[service._id_index[pid]].to_dict() for pid in ids[:20]]
+
+    print(f"players: {n:,}, models: {', '.join(scorer.ensemble.models)}, grid: {len(AGES)} ages")
+    for label, fn in [
+        ("per-point predict", lambda r: per_point(scorer, r)),
+        ("one grid predict", lambda r: scorer.valuations(r, "age", AGES))
+    ]:
+        times = []
+        for r in records:
+            start = time.perf_counter()
+            fn(r)
+            times.append(time.perf_counter() - start)
+        print(f"  {label:18s} median {np.median(times) * 1e3:7.2f} ms per request")
+
+    for label, window in [("no batching", None), ("batched, 0 ms", 0.0), ("batched, 2 ms", 0.002)]:
+        service._whatif = WhatIfScorer(scorer.ensemble, scorer.pipeline, window or 0.0)
+        if window is None:
+            service._whatif._batcher = service._whatif._predict
+        elapsed = concurrent(service, ids, threads)
+        batches = getattr(service._whatif._batcher, "batches", len(ids))
+        print(f"  {threads} threads, {label:13s} {len(ids) / elapsed:8.0f} requests/s ({batches} predict batches)")
@@ -0,0 +1,70 @@
+"""Synthetic player tables shaped like ``data/cleaned_player_data.csv``."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from eda.column_groups import COLUMN_GROUPS
+from data_service import ROLE_GROUP_MAP
+
+STAT_GROUPS = [
+    "playing_time", "rating_performance", "attacking_output", "chance_creation",
+    "passing_buildup", "dribbling_carrying", "defensive_actions", "duels_physical",
+    "discipline_fouls", "errors_mistakes", "set_pieces_penalties", "goalkeeping"
+]
+
+FIRST_NAMES = ["Luka", "José", "Kylian", "Erling", "Mohamed", "Kevin", "Virgil", "Bruno", "Ángel", "Søren"]
+LAST_NAMES = ["Modrić", "Müller", "Mbappé", "Haaland", "Salah", "De Bruyne", "van Dijk", "Fernandes", "Di María", "Kjær"]
+
+
+def make_players(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    stats = [c for g in STAT_GROUPS for c in COLUMN_GROUPS[g]]
+    df = pd.DataFrame({c: np.round(rng.gamma(2.0, 10.0, n), 1) for c in stats})
+    for c in stats[::5]:
+        df.loc[rng.random(n) < 0.1, c] = np.nan
+
+    df["rating"] = np.round(rng.normal(6.9, 0.3, n), 2)
+    df["appearances"] = rng.integers(0, 40, n).astype(float)
+    df["minutesPlayed"] = df["appearances"] * rng.integers(10, 91, n)
+
+    names = [
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // 7) % len(LAST_NAMES)]} {i}"
+        for i in range(n)
+    ]
+    teams = [f"Club {i} ~ League {i % 5}" for i in range(max(5, n // 25))]
+    positions = list(ROLE_GROUP_MAP)
+
+    df.insert(0, "playerId", rng.permutation(n) + 100000)
+    df.insert(1, "name", names)
+    df.insert(2, "player_name", names)
+    df["teamName"] = np.asarray(teams, dtype=object)[rng.integers(0, len(teams), n)]
+    df["position"] = np.asarray(positions, dtype=object)[rng.integers(0, len(positions), n)]
+    df["positionId"] = rng.integers(1, 14, n)
+    df["firstSidePosition"] = np.where(rng.random(n) < 0.4, "Left-Back", None)
+    # Cleaning fills missing side positions with the text 'None'
+    df["firstSidePositionId"] = np.where(df["firstSidePosition"].notna(), "6", "None")
+    df["secondSidePosition"] = None
+    df["secondSidePositionId"] = "None"
+    df["preferredFoot"] = np.where(rng.random(n) < 0.7, "Right", "Left")
+    df["preferredFootId"] = np.where(df["preferredFoot"] == "Right", 2, 1)
+    df["date_of_birth"] = "1998-05-01"
+    df["nationalityId"] = rng.integers(1, 200, n)
+    df["contractUntil"] = "2027-06-30"
+    df["age"] = rng.integers(16, 38, n).astype(float)
+    df["height"] = np.round(rng.normal(1.8, 0.07, n), 2)
+    df["MarketValuePrevious"] = (rng.integers(1, 200, n) * 250000).astype(float)
+    df["MarketValueCurrent"] = df["MarketValuePrevious"] * rng.choice([0.5, 1.0, 1.0, 1.5, 2.0], n)
+    df["MarketValueCurrency"] = "EUR"
+    return df
+
+
+def write_players_csv(n: int, path: str | Path, seed: int = 42) -> Path:
+    path = Path(path)
+    make_players(n, seed).to_csv(path, index=False)
+    return path
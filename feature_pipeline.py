@@ -0,0 +1,215 @@
+"""Feature pipeline shared by training (``data_final.py``) and serving.
+
+``FeaturePipeline.fit`` learns everything the features depend on beyond a
+single row: the label-encoder classes of the text columns, the input and
+output column order and the ``rating`` mean behind ``rating_diff``.
+``save``/``load`` persist that state as JSON next to the model checkpoints.
+
+``transform`` is the vectorized batch path; ``transform_row`` scores one
+record with plain Python arithmetic for online use. Both apply the same
+operations in the same order, so they give identical values.
+"""
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PIPELINE_VERSION = 1
+
+# Dropped before training
+DROP_COLUMNS = [
+    'playerId', 'playerID', 'player_name', 'name', 'date_of_birth',
+    'MarketValueCurrency', 'id', 'type',
+    'preferredFoot', 'teamName',
+    'position', 'firstSidePosition', 'secondSidePosition', 'contractUntil'
+]
+
+# Market values: the target is derived from them, so they are never features
+VALUE_COLUMNS = ['MarketValuePrevious', 'MarketValueCurrent']
+
+# Text value label-encoded for missing entries
+MISSING_LABEL = 'Unknown'
+
+# Derived features of the form ``numerator / denominator * scale`` (0 when
+# the denominator is not positive), in output order
+RATIO_FEATURES = {
+    'goals_per_90': ('goals', 'minutesPlayed', 90),
+    'assists_per_90': ('assists', 'minutesPlayed', 90),
+    'goal_involvement': None,
+    'goal_involvement_per_90': ('goal_involvement', 'minutesPlayed', 90),
+    'shots_on_target_pct': ('shotsOnTarget', 'totalShots', 100),
+    'big_chance_conversion': ('goals', 'big_chances', 100),
+    'duels_won_per_90': ('totalDuelsWon', 'minutesPlayed', 90),
+    'touches_per_90': ('touches', 'minutesPlayed', 90),
+    'key_passes_per_90': ('keyPasses', 'minutesPlayed', 90),
+    'dribbles_per_90': ('successfulDribbles', 'minutesPlayed', 90),
+    'interceptions_per_90': ('interceptions', 'minutesPlayed', 90),
+    'tackles_per_90': ('tackles', 'minutesPlayed', 90),
+    'clearances_per_90': ('clearances', 'minutesPlayed', 90),
+    'age_squared': None,
+    'is_peak_age': None,
+    'is_young_talent': None,
+    'rating_diff': None,
+    'minutes_per_appearance': ('minutesPlayed', 'appearances', 1),
+    'passes_per_90': ('totalPasses', 'minutesPlayed', 90)
+}
+
+DERIVED_FEATURES = list(RATIO_FEATURES)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, scale: float) -> np.ndarray:
+    out = np.zeros(len(num))
+    positive = den > 0
+    out[positive] = num[positive] / den[positive] * scale
+    return out
+
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class FeaturePipeline:
+    """Fit once on the training frame, then transform batches or single rows."""
+
+    def __init__(self):
+        self.input_columns = []
+        self.encoders = {}
+        self.rating_mean = math.nan
+        self.feature_columns = []
+        self._codes = {}
+
+    @property
+    def is_fitted(self) -> bool:
+        return bool(self.feature_columns)
+
+    def fit(self, df: pd.DataFrame) -> "FeaturePipeline":
+        data = df.drop(columns=DROP_COLUMNS + VALUE_COLUMNS, errors='ignore')
+        self.input_columns = list(data.columns)
+        self.encoders = {}
+        for col in data.select_dtypes(include=['object', 'category']).columns:
+            labels = data[col].astype(object).where(data[col].notna(), MISSING_LABEL).astype(str)
+            self.encoders[col] = sorted(labels.unique().tolist())
+        rating = pd.to_numeric(data.get('rating'), errors='coerce')
+        self.rating_mean = float(rating.mean()) if rating is not None else math.nan
+        self.feature_columns = self.input_columns + [
+            c for c in DERIVED_FEATURES if c not in self.input_columns
+        ]
+        self._index_encoders()
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def _index_encoders(self):
+        self._codes = {
+            col: {label: code for code, label in enumerate(classes)}
+            for col, classes in self.encoders.items()
+        }
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feature frame for every row of ``df``, in ``feature_columns`` order."""
+        if not self.is_fitted:
+            raise ValueError("FeaturePipeline is not fitted")
+        n = len(df)
+        columns = {}
+        for col in self.input_columns:
+            if col not in df.columns:
+                columns[col] = np.full(n, np.nan)
+            elif col in self._codes:
+                labels = df[col].astype(object).where(df[col].notna(), MISSING_LABEL).astype(str)
+                # Labels unseen at fit time get -1
+                columns[col] = labels.map(self._codes[col]).fillna(-1).to_numpy(np.float64)
+            else:
+                columns[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(np.float64)
+
+        def get(name):
+            return columns[name] if name in columns else np.full(n, np.nan)
+
+        goals, assists, age = get('goals'), get('assists'), get('age')
+        derived = {'goal_involvement': goals + assists, 'big_chances': get('bigChancesMissed') + goals}
+        for name, spec in RATIO_FEATURES.items():
+            if spec is not None:
+                num, den, scale = spec
+                source = derived if num in derived else columns
+                num = source[num] if num in source else np.full(n, np.nan)
+                den = derived[den] if den in derived else get(den)
+                derived[name] = _ratio(num, den, scale)
+        derived['age_squared'] = age ** 2
+        derived['is_peak_age'] = ((age >= 25) & (age <= 29)).astype(np.float64)
+        derived['is_young_talent'] = (age < 23).astype(np.float64)
+        derived['rating_diff'] = get('rating') - self.rating_mean
+
+        # Column-major, so every feature is one contiguous write
+        matrix = np.empty((n, len(self.feature_columns)), order='F')
+        for j, col in enumerate(self.feature_columns):
+            matrix[:, j] = derived[col] if col in DERIVED_FEATURES else columns[col]
+        np.copyto(matrix, 0.0, where=~np.isfinite(matrix))
+        return pd.DataFrame(matrix, columns=self.feature_columns, index=df.index)
+
+    def transform_row(self, record: dict) -> list[float]:
+        """Features of one record (column -> value), in ``feature_columns`` order."""
+        if not self.is_fitted:
+            raise ValueError("FeaturePipeline is not fitted")
+        values = {}
+        for col in self.input_columns:
+            value = record.get(col)
+            if col in self._codes:
+                missing = value is None or (isinstance(value, float) and math.isnan(value))
+                label = MISSING_LABEL if missing else str(value)
+                values[col] = float(self._codes[col].get(label, -1))
+            else:
+                values[col] = _number(value) if value is not None else math.nan
+
+        nan = math.nan
+        goals, assists, age = values.get('goals', nan), values.get('assists', nan), values.get('age', nan)
+        derived = {'goal_involvement': goals + assists, 'big_chances': values.get('bigChancesMissed', nan) + goals}
+        for name, spec in RATIO_FEATURES.items():
+            if spec is not None:
+                num, den, scale = spec
+                num = derived[num] if num in derived else values.get(num, nan)
+                den = derived[den] if den in derived else values.get(den, nan)
+                derived[name] = num / den * scale if den > 0 else 0.0
+        derived['age_squared'] = age ** 2
+        derived['is_peak_age'] = 1.0 if 25 <= age <= 29 else 0.0
+        derived['is_young_talent'] = 1.0 if age < 23 else 0.0
+        derived['rating_diff'] = values.get('rating', nan) - self.rating_mean
+
+        out = [derived[c] if c in DERIVED_FEATURES else values[c] for c in self.feature_columns]
+        return [v if math.isfinite(v) else 0.0 for v in out]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": PIPELINE_VERSION,
+            "input_columns": self.input_columns,
+            "encoders": self.encoders,
+            "rating_mean": None if math.isnan(self.rating_mean) else self.rating_mean,
+            "feature_columns": self.feature_columns
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "FeaturePipeline":
+        if state.get("version") != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported feature pipeline version {state.get('version')}")
+        pipeline = cls()
+        pipeline.input_columns = list(state["input_columns"])
+        pipeline.encoders = {col: list(classes) for col, classes in state["encoders"].items()}
+        pipeline.rating_mean = math.nan if state["rating_mean"] is None else float(state["rating_mean"])
+        pipeline.feature_columns = list(state["feature_columns"])
+        pipeline._index_encoders()
+        return pipeline
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FeaturePipeline":
+        return cls.from_dict(json.loads(Path(path).read_text()))
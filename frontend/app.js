@@ -81,13 +81,13 @@ function setupCompareSearch(inputId, dropdownId, playerNum) {
                 return;
             }
             try {
-                const res = await fetch(`${API_BASE}/players?search=${encodeURIComponent(query)}&limit=10`);
-                const data = await res.json();
-                if (data.players.length > 0) {
-                    dropdown.innerHTML = data.players.map(p => `
+                const res = await fetch(`${API_BASE}/players/suggest?q=${encodeURIComponent(query)}&limit=10`);
+                const players = await res.json();
+                if (players.length > 0) {
+                    dropdown.innerHTML = players.map(p => `
                         <div class="compare-dropdown-item" data-id="${p.playerId}">
                             <div class="player-name">${esc(p.name)}</div>
-                            <div class="player-team">${esc(p.teamName)} · ${p.positionGroup}</div>
+                            <div class="player-team">${esc(p.teamName)}</div>
                         </div>
                     `).join('');
                     dropdown.classList.remove('hidden');
@@ -278,6 +278,8 @@ async function loadPlayers() {
     const search = $('searchInput').value.trim();
     if (search) params.append('search', search);
 
+    loadFacets(params);
+
     try {
         const res = await fetch(`${API_BASE}/players?${params}`);
         const data = await res.json();
@@ -293,6 +295,21 @@ async function loadPlayers() {
     $('loadingIndicator').style.display = 'none';
 }
 
+async function loadFacets(params) {
+    const facetParams = new URLSearchParams(params);
+    ['page', 'limit', 'sortBy', 'sortOrder'].forEach(k => facetParams.delete(k));
+    try {
+        const res = await fetch(`${API_BASE}/players/facets?${facetParams}`);
+        const data = await res.json();
+        const counts = Object.fromEntries(data.positionGroups.map(g => [g.id, g.count]));
+        counts.ALL = data.positionGroups.reduce((sum, g) => sum + g.count, 0);
+        $('positionFilters').querySelectorAll('.tab').forEach(t => {
+            const label = t.dataset.position === 'ALL' ? 'All' : t.dataset.position;
+            t.textContent = `${label} (${(counts[t.dataset.position] || 0).toLocaleString()})`;
+        });
+    } catch (e) { console.error(e); }
+}
+
 function renderTable(players) {
     const start = (currentPage - 1) * 50;
     $('playerTableBody').innerHTML = players.map((p, i) => `
@@ -344,6 +361,7 @@ function renderDetail(p) {
 
     $('contractUntil').textContent = p.contractUntil ? fmtDate(p.contractUntil) : '-';
     $('previousValue').textContent = fmtVal(p.marketValuePrevious);
+    $('predictedValue').textContent = fmtVal(p.predictedValue != null ? Math.round(p.predictedValue) : null);
 
     updateRadar(p.radar);
 
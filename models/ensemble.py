@@ -0,0 +1,193 @@
+"""Ensemble of the trained regressors, run concurrently on a thread pool.
+
+XGBoost, LightGBM and CatBoost release the GIL while predicting, so the
+members run side by side and an ensemble call takes about as long as its
+slowest member instead of the sum of all three. Member predictions are
+combined with a weighted mean or a fitted stacking model, and every
+member's predict latency is recorded.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def feature_names(model) -> list[str]:
+    # sklearn-style wrappers, then a bare LightGBM Booster
+    for attr in ("feature_names_in_", "feature_name_", "feature_names_", "feature_name"):
+        names = getattr(model, attr, None)
+        if callable(names):
+            names = names()
+        if names is not None:
+            return list(names)
+    raise ValueError(f"{type(model).__name__} does not record its feature names")
+
+
+def _check_columns(name: str, given, expected: list[str]):
+    """Raise unless ``given`` is a reordering of the ``expected`` features."""
+    given_set, expected_set = set(given), set(expected)
+    missing = [c for c in expected if c not in given_set]
+    unexpected = [c for c in given if c not in expected_set]
+    if missing or unexpected:
+        raise ValueError(
+            f"Features for {name} do not match its training columns: "
+            f"missing {missing}, unexpected {unexpected}"
+        )
+
+
+class ModelTiming:
+    """Running predict latency of one member."""
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, rows: int):
+        self.calls += 1
+        self.rows += rows
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rows": self.rows,
+            "meanMs": self.total / self.calls * 1e3 if self.calls else 0.0,
+            "lastMs": self.last * 1e3,
+            "maxMs": self.max * 1e3
+        }
+
+
+class EnsemblePredictor:
+    """Predict with every member at once and combine the results.
+
+    ``weights`` maps member names to weights of the mean (equal by
+    default); after ``fit_stacker`` a stacking model over the member
+    predictions is used instead. Frames must hold exactly the features
+    each member was trained with; they are put in its column order and
+    passed on as arrays. Batches
+    under ``parallel_min_rows`` rows run the members inline, where handing
+    them to the pool costs more than it saves.
+    """
+
+    def __init__(
+        self,
+        models: dict,
+        weights: dict | None = None,
+        stacker=None,
+        parallel_min_rows: int = 64
+    ):
+        self.models = dict(models)
+        self.weights = None
+        self.stacker = stacker
+        self.parallel_min_rows = parallel_min_rows
+        self.timings = {name: ModelTiming() for name in self.models}
+        self._features = {name: _feature_names_or_none(m) for name, m in self.models.items()}
+        self._timing_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(len(self.models), 1), thread_name_prefix="ensemble"
+        ) if len(self.models) > 1 else None
+        if weights is not None:
+            self.set_weights(weights)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def set_weights(self, weights: dict):
+        unknown = set(weights) - set(self.models)
+        if unknown:
+            raise ValueError(f"Weights given for unknown models: {sorted(unknown)}")
+        total = float(sum(weights.get(name, 0.0) for name in self.models))
+        if total <= 0:
+            raise ValueError("Weights must sum to a positive value")
+        self.weights = {name: weights.get(name, 0.0) / total for name in self.models}
+        self.stacker = None
+
+    def _inputs(self, X) -> dict:
+        """Per-member input: frames become float arrays in the member's column order.
+
+        The wrappers validate a frame's columns on every call, which
+        dominates small batches; each distinct column order is built once.
+        """
+        if not isinstance(X, pd.DataFrame):
+            return {name: X for name in self.models}
+        arrays = {}
+        inputs = {}
+        for name, columns in self._features.items():
+            key = tuple(columns) if columns is not None else None
+            if key not in arrays:
+                if columns is None:
+                    arrays[key] = X
+                else:
+                    if list(X.columns) != columns:
+                        _check_columns(name, X.columns, columns)
+                    frame = X if list(X.columns) == columns else X[columns]
+                    arrays[key] = frame.to_numpy(np.float64)
+            inputs[name] = arrays[key]
+        return inputs
+
+    def _predict_one(self, name: str, X) -> np.ndarray:
+        model = self.models[name]
+        start = time.perf_counter()
+        out = np.asarray(model.predict(X), dtype=np.float64).ravel()
+        elapsed = time.perf_counter() - start
+        with self._timing_lock:
+            self.timings[name].add(elapsed, len(out))
+        return out
+
+    def predict_all(self, X) -> dict[str, np.ndarray]:
+        """Every member's prediction for ``X``, by name."""
+        inputs = self._inputs(X)
+        if self._pool is None or len(X) < self.parallel_min_rows:
+            return {name: self._predict_one(name, inputs[name]) for name in self.models}
+        futures = {name: self._pool.submit(self._predict_one, name, inputs[name]) for name in self.models}
+        return {name: future.result() for name, future in futures.items()}
+
+    def combine(self, predictions: dict[str, np.ndarray]) -> np.ndarray:
+        """Combine member predictions from ``predict_all``."""
+        if self.stacker is not None:
+            return np.asarray(
+                self.stacker.predict(np.column_stack([predictions[n] for n in self.models])),
+                dtype=np.float64
+            ).ravel()
+        if self.weights is None:
+            return np.mean([predictions[n] for n in self.models], axis=0)
+        return np.sum([predictions[n] * self.weights[n] for n in self.models], axis=0)
+
+    def predict(self, X) -> np.ndarray:
+        return self.combine(self.predict_all(X))
+
+    def fit_stacker(self, X, y, stacker=None) -> "EnsemblePredictor":
+        """Fit a stacking model on member predictions for held-out ``X``/``y``.
+
+        Defaults to a non-negative linear regression.
+        """
+        if stacker is None:
+            from sklearn.linear_model import LinearRegression
+            stacker = LinearRegression(positive=True)
+        predictions = self.predict_all(X)
+        stacker.fit(np.column_stack([predictions[n] for n in self.models]), np.ravel(y))
+        self.stacker = stacker
+        return self
+
+    def timing_stats(self) -> dict[str, dict]:
+        with self._timing_lock:
+            return {name: timing.as_dict() for name, timing in self.timings.items()}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+def _feature_names_or_none(model) -> list[str] | None:
+    try:
+        return feature_names(model)
+    except ValueError:
+        return None
@@ -47,19 +47,59 @@ def eval(delta_pred_org, df, model_name):
     }
 
 model_path = 'models/checkpoints/'
+import os
+import sys
 import joblib
-xgb_model = joblib.load(model_path+'xgb_model.pkl')
-lgbm_model = joblib.load(model_path+'lgbm_model.pkl')
-catboost_model = joblib.load(model_path+'catboost_model.pkl')
+from ensemble import EnsemblePredictor
+from split_store import has_table, load_table
+
+MODEL_NAMES = {
+    'xgb': 'XGBoost Regressor',
+    'lgbm': 'LightGBM Regressor',
+    'catboost': 'CatBoost Regressor'
+}
+
+ensemble = EnsemblePredictor({
+    'xgb': joblib.load(model_path+'xgb_model.pkl'),
+    'lgbm': joblib.load(model_path+'lgbm_model.pkl'),
+    'catboost': joblib.load(model_path+'catboost_model.pkl')
+})
+# Memory-mapped from data/split/npy/ when data_final.py wrote it, else parsed from the CSVs
 data_path = 'data/split/'
-X_test =  pd.read_csv(data_path+'X_test.csv')  
-y_test =  pd.read_csv(data_path+'y_test.csv') 
-values_df_test =  pd.read_csv(data_path+'values_df_test.csv')  
+X_test = load_table(data_path, 'X_test')
+y_test = load_table(data_path, 'y_test')
+values_df_test = load_table(data_path, 'values_df_test')
+
+# All three models predict concurrently
+delta_preds = ensemble.predict_all(X_test)
+
+results = [eval(delta_preds[name], values_df_test.copy(), label) for name, label in MODEL_NAMES.items()]
+results.append(eval(ensemble.combine(delta_preds), values_df_test.copy(), 'Ensemble (mean)'))
+
+# Stacking weights are fitted on the validation split, never on the test split
+if has_table(data_path, 'X_valid'):
+    X_valid = load_table(data_path, 'X_valid')
+    y_valid = load_table(data_path, 'y_valid')
+    ensemble.fit_stacker(X_valid, y_valid)
+    print(f"\nStacking weights: {dict(zip(ensemble.models, np.round(ensemble.stacker.coef_, 4)))}")
+    results.append(eval(ensemble.combine(delta_preds), values_df_test.copy(), 'Ensemble (stacked)'))
 
-delta_pred_xgb = xgb_model.predict(X_test)
-delta_pred_lgbm = lgbm_model.predict(X_test)
-delta_pred_catboost = catboost_model.predict(X_test)
+print(f"\n{'='*50}")
+print("Predict latency per model")
+print(f"{'='*50}")
+for name, timing in ensemble.timing_stats().items():
+    print(f"  {MODEL_NAMES[name]:20s} {timing['meanMs']:8.1f} ms/call over {timing['calls']} calls")
+ensemble.close()
 
-results_xgb = eval(delta_pred_xgb, values_df_test.copy(), 'XGBoost Regressor')
-results_lgbm = eval(delta_pred_lgbm, values_df_test.copy(), 'LightGBM Regressor')
-results_catboost = eval(delta_pred_catboost, values_df_test.copy(), 'CatBoost Regressor')
\ No newline at end of file
+# With --register, add the evaluated models to the registry as a new version;
+# serve it with `python models/registry.py promote <version>`
+if '--register' in sys.argv[1:]:
+    from registry import PIPELINE_FILE, ModelRegistry
+    pipeline_path = model_path+PIPELINE_FILE
+    version = ModelRegistry(model_path).export(
+        ensemble.models,
+        train_files=[data_path+'X_train.csv', data_path+'y_train.csv'],
+        metrics={r['model']: {k: float(v) for k, v in r.items() if k != 'model'} for r in results},
+        pipeline=pipeline_path if os.path.exists(pipeline_path) else None
+    )
+    print(f"\nRegistered {version} in {model_path}")
@@ -1,18 +1,34 @@
 from xgboost import XGBRegressor
 from lightgbm import LGBMRegressor
 from catboost import CatBoostRegressor
-import lightgbm as lgb
-import pandas as pd
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import RandomizedSearchCV
 import joblib
+from tuning import BACKENDS, SuccessiveHalvingSearch, TrainingScheduler, TrialJournal, available_cores, core_split
+from split_store import load_table
 
-data_path = 'data/split/'
-X_train =  pd.read_csv(data_path+'X_train.csv')
-y_train =  pd.read_csv(data_path+'y_train.csv')  
-X_valid =  pd.read_csv(data_path+'X_valid.csv')  
-y_valid =  pd.read_csv(data_path+'y_valid.csv')  
+# 'halving': successive halving over boosting rounds with early stopping on the CV folds
+# 'random': full-length fits of every sampled candidate (RandomizedSearchCV)
+TUNING_MODE = os.environ.get('TUNING_MODE', 'halving')
+
+# Core budget: TRAIN_CORES cores run TRAIN_CORES // TRIAL_THREADS trials at once,
+# each with TRIAL_THREADS model threads
+TRAIN_CORES = int(os.environ.get('TRAIN_CORES', '0')) or available_cores()
+TRIAL_THREADS = int(os.environ.get('TRIAL_THREADS', '1'))
+
+# Per-trial wall and CPU time
+TUNING_LOG = os.environ.get('TUNING_LOG', 'models/tuning.log')
 
-print("Training XGBoost with Hyperparameter Tuning...")
+# Every finished fold fit; a rerun on the same data skips the fits recorded here.
+# WARM_START=k also puts the k best recorded candidates of each model in the search.
+TUNING_JOURNAL = os.environ.get('TUNING_JOURNAL', 'models/tuning_journal.jsonl')
+WARM_START = int(os.environ.get('WARM_START', '0'))
+
+# Memory-mapped from data/split/npy/ when data_final.py wrote it, else parsed from the CSVs
+data_path = 'data/split/'
 
 xgb_param_grid = {
     'n_estimators': [100, 200, 300, 500],
@@ -25,26 +41,6 @@ xgb_param_grid = {
     'reg_lambda': [0, 0.1, 1.0]
 }
 
-xgb_base = XGBRegressor(random_state=42, n_jobs=-1, verbosity=0)
-
-xgb_random_search = RandomizedSearchCV(
-    xgb_base,
-    param_distributions=xgb_param_grid,
-    n_iter=50,
-    cv=5,
-    scoring='neg_root_mean_squared_error',
-    random_state=42,
-    n_jobs=-1,
-    verbose=1
-)
-
-xgb_random_search.fit(X_train, y_train)
-
-print(f"\nBest XGBoost Parameters: {xgb_random_search.best_params_}")
-print(f"Best CV Score (RMSE): {-xgb_random_search.best_score_:.4f}")
-
-print("Training LightGBM with Hyperparameter Tuning...")
-
 lgbm_param_grid = {
     'n_estimators': [100, 200, 300, 500],
     'max_depth': [3, 5, 7, 10],
@@ -57,27 +53,6 @@ lgbm_param_grid = {
     'reg_lambda': [0, 0.1, 1.0]
 }
 
-lgbm_base = LGBMRegressor(random_state=42, n_jobs=-1, verbosity=-1)
-
-lgbm_random_search = RandomizedSearchCV(
-    lgbm_base,
-    param_distributions=lgbm_param_grid,
-    n_iter=50, 
-    cv=5,
-    scoring='neg_root_mean_squared_error',
-    random_state=42,
-    n_jobs=-1,
-    verbose=1
-)
-
-lgbm_random_search.fit(X_train, y_train)
-
-print(f"\nBest LightGBM Parameters: {lgbm_random_search.best_params_}")
-print(f"Best CV Score (RMSE): {-lgbm_random_search.best_score_:.4f}")
-
-
-print("Training CatBoost with Hyperparameter Tuning...")
-
 catboost_param_grid = {
     'iterations': [100, 200, 300, 500],
     'depth': [4, 6, 8, 10],
@@ -88,34 +63,85 @@ catboost_param_grid = {
     'border_count': [32, 64, 128]
 }
 
-catboost_base = CatBoostRegressor(
-    random_state=42,
-    verbose=0,
-    thread_count=-1,
-)
-
-catboost_random_search = RandomizedSearchCV(
-    catboost_base,
-    param_distributions=catboost_param_grid,
-    n_iter=50,
-    cv=5,
-    scoring='neg_root_mean_squared_error',
-    random_state=42,
-    n_jobs=-1,
-    verbose=1
-)
-
-catboost_random_search.fit(X_train, y_train)
-
-print(f"\nBest CatBoost Parameters: {catboost_random_search.best_params_}")
-print(f"Best CV Score (RMSE): {-catboost_random_search.best_score_:.4f}")
-
-xgb_best = xgb_random_search.best_estimator_
-lgbm_best = lgbm_random_search.best_estimator_
-catboost_best = catboost_random_search.best_estimator_
-
-#Save trained models
-model_path = 'models/checkpoints/'
-joblib.dump(xgb_best, model_path+'xgb_model.pkl')
-joblib.dump(lgbm_best, model_path+'lgbm_model.pkl')
-joblib.dump(catboost_best, model_path+'catboost_model.pkl')
\ No newline at end of file
+SEARCHES = {
+    'xgb': ('XGBoost', xgb_param_grid),
+    'lgbm': ('LightGBM', lgbm_param_grid),
+    'catboost': ('CatBoost', catboost_param_grid)
+}
+
+def random_search(name, label, param_grid, X_train, y_train, workers, threads):
+    print(f"Training {label} with Hyperparameter Tuning...")
+    base = {
+        'xgb': lambda: XGBRegressor(random_state=42, n_jobs=threads, verbosity=0),
+        'lgbm': lambda: LGBMRegressor(random_state=42, n_jobs=threads, verbosity=-1),
+        'catboost': lambda: CatBoostRegressor(random_state=42, verbose=0, thread_count=threads)
+    }[name]()
+    search = RandomizedSearchCV(
+        base,
+        param_distributions=param_grid,
+        n_iter=50,
+        cv=5,
+        scoring='neg_root_mean_squared_error',
+        random_state=42,
+        n_jobs=workers,
+        verbose=1
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    return search, time.perf_counter() - start
+
+def halving_search(name, label, param_grid, X_train, y_train, scheduler, journal):
+    print(f"Training {label} with Hyperparameter Tuning...")
+    search = SuccessiveHalvingSearch(
+        BACKENDS[name](), param_grid, n_iter=50, cv=5, random_state=42,
+        scheduler=scheduler, journal=journal, warm_start=WARM_START
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    return search, time.perf_counter() - start
+
+if __name__ == '__main__':
+    logging.basicConfig(filename=TUNING_LOG, level=logging.INFO, format='%(asctime)s %(message)s')
+
+    X_train = load_table(data_path, 'X_train')
+    y_train = load_table(data_path, 'y_train')
+
+    workers, threads = core_split(TRAIN_CORES, TRIAL_THREADS)
+    print(f"Core budget: {TRAIN_CORES} cores, {workers} trials at a time x {threads} threads each")
+
+    start = time.perf_counter()
+    if TUNING_MODE == 'random':
+        # One search at a time: each already fills the budget
+        results = {
+            name: random_search(name, label, grid, X_train, y_train, workers, threads)
+            for name, (label, grid) in SEARCHES.items()
+        }
+    else:
+        journal = TrialJournal(TUNING_JOURNAL)
+        print(f"Journal: {len(journal)} fits recorded in {TUNING_JOURNAL}")
+        # The three searches run at once and share the scheduler's workers
+        with TrainingScheduler(TRAIN_CORES, TRIAL_THREADS) as scheduler, ThreadPoolExecutor(len(SEARCHES)) as pool:
+            futures = {
+                name: pool.submit(halving_search, name, label, grid, X_train, y_train, scheduler, journal)
+                for name, (label, grid) in SEARCHES.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+
+    for name, (search, seconds) in results.items():
+        label = SEARCHES[name][0]
+        print(f"\nBest {label} Parameters: {search.best_params_}")
+        print(f"Best CV Score (RMSE): {-search.best_score_:.4f}")
+        print(f"Tuning time ({TUNING_MODE}): {seconds:.1f}s")
+    print(f"\nTotal tuning time: {time.perf_counter() - start:.1f}s")
+    if TUNING_MODE != 'random':
+        print(f"Per-trial wall and CPU time: {TUNING_LOG}")
+
+    xgb_best = results['xgb'][0].best_estimator_
+    lgbm_best = results['lgbm'][0].best_estimator_
+    catboost_best = results['catboost'][0].best_estimator_
+
+    #Save trained models
+    model_path = 'models/checkpoints/'
+    joblib.dump(xgb_best, model_path+'xgb_model.pkl')
+    joblib.dump(lgbm_best, model_path+'lgbm_model.pkl')
+    joblib.dump(catboost_best, model_path+'catboost_model.pkl')
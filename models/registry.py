@@ -0,0 +1,284 @@
+"""Versioned model registry in the libraries' native formats.
+
+Each version is a directory holding every model in its own booster format
+(XGBoost UBJSON, LightGBM text, CatBoost cbm) and a ``manifest.json`` with
+the feature order, a hash of the training data, evaluation metrics and
+the library versions that wrote it::
+
+    models/checkpoints/
+        CURRENT             # name of the promoted version
+        v0001/manifest.json
+        v0001/xgb.ubj  v0001/lgbm.txt  v0001/catboost.cbm
+
+Versions are written to a temporary directory and renamed into place, and
+``promote`` replaces ``CURRENT`` with one rename, so a reader never sees a
+half-written version. Models load in parallel on background threads.
+
+    python models/registry.py list
+    python models/registry.py promote v0002
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from ensemble import EnsemblePredictor, feature_names
+
+logger = logging.getLogger(__name__)
+
+
+REGISTRY_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+# Fitted feature pipeline, in each version and next to the pickled checkpoints
+PIPELINE_FILE = "feature_pipeline.json"
+
+# Format name -> file suffix
+FORMAT_SUFFIXES = {
+    "xgboost-ubj": ".ubj",
+    "lightgbm-text": ".txt",
+    "catboost-cbm": ".cbm"
+}
+
+
+def data_hash(paths: list[str | Path]) -> str:
+    """SHA-256 over the bytes of ``paths``, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return "sha256:" + digest.hexdigest()
+
+
+def _model_format(model) -> str:
+    module = type(model).__module__.split(".")[0]
+    formats = {"xgboost": "xgboost-ubj", "lightgbm": "lightgbm-text", "catboost": "catboost-cbm"}
+    if module not in formats:
+        raise ValueError(f"No native format for {type(model).__name__}")
+    return formats[module]
+
+
+def _library_version(fmt: str) -> str:
+    library = __import__(fmt.split("-")[0])
+    return getattr(library, "__version__", "unknown")
+
+
+def save_native(model, path: Path, fmt: str):
+    if fmt == "xgboost-ubj":
+        model.save_model(path)
+    elif fmt == "lightgbm-text":
+        booster = getattr(model, "booster_", model)
+        booster.save_model(str(path))
+    elif fmt == "catboost-cbm":
+        model.save_model(str(path), format="cbm")
+    else:
+        raise ValueError(f"Unknown model format {fmt!r}")
+
+
+def load_native(path: Path, fmt: str):
+    """Load a model saved by ``save_native``; every result has ``predict``."""
+    if fmt == "xgboost-ubj":
+        from xgboost import XGBRegressor
+        model = XGBRegressor()
+        model.load_model(path)
+        return model
+    if fmt == "lightgbm-text":
+        import lightgbm
+        return lightgbm.Booster(model_file=str(path))
+    if fmt == "catboost-cbm":
+        from catboost import CatBoostRegressor
+        return CatBoostRegressor().load_model(str(path), format="cbm")
+    raise ValueError(f"Unknown model format {fmt!r}")
+
+
+def _load_checked(path: Path, fmt: str, features: list[str] | None):
+    model = load_native(path, fmt)
+    if features is not None and feature_names(model) != features:
+        raise ValueError(f"{path.name} does not match the feature order in the manifest")
+    return model
+
+
+class ModelSet:
+    """Models loading in parallel in the background.
+
+    Loading starts on construction; ``models()`` and ``ensemble()`` wait
+    for it, so callers can do other work (such as reading the data) in the
+    meantime. A model that fails to load is logged and left out.
+    """
+
+    def __init__(
+        self,
+        loaders: dict[str, Callable],
+        version: str | None = None,
+        manifest: dict | None = None,
+        pipeline_path: Path | None = None
+    ):
+        self.version = version
+        self.manifest = manifest or {}
+        self.pipeline_path = pipeline_path
+        self._ensemble = None
+        self._lock = threading.Lock()
+        self._futures = {}
+        if loaders:
+            pool = ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="model-load")
+            self._futures = {name: pool.submit(load) for name, load in loaders.items()}
+            pool.shutdown(wait=False)
+
+    def models(self) -> dict:
+        models = {}
+        for name, future in self._futures.items():
+            try:
+                models[name] = future.result()
+            except Exception:
+                logger.exception("Could not load model %s (%s); serving without it", name, self.version)
+        return models
+
+    def ensemble(self) -> EnsemblePredictor:
+        with self._lock:
+            if self._ensemble is None:
+                self._ensemble = EnsemblePredictor(self.models())
+            return self._ensemble
+
+
+class ModelRegistry:
+    """Versions of the model set under one directory."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    @property
+    def current_path(self) -> Path:
+        return self.root / CURRENT_FILE
+
+    def versions(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(
+            p.name for p in self.root.iterdir()
+            if p.is_dir() and p.name.startswith("v") and (p / MANIFEST_FILE).exists()
+        )
+
+    def current_version(self) -> str | None:
+        try:
+            version = self.current_path.read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def manifest(self, version: str) -> dict:
+        return json.loads((self.root / version / MANIFEST_FILE).read_text())
+
+    def export(
+        self,
+        models: dict,
+        train_files: list[str | Path] = (),
+        metrics: dict | None = None,
+        pipeline: str | Path | None = None
+    ) -> str:
+        """Write ``models`` as a new version and return its name (not promoted).
+
+        ``train_files`` are hashed into the manifest; ``pipeline`` is a saved
+        feature pipeline copied alongside the models.
+        """
+        if not models:
+            raise ValueError("No models to export")
+        features = None
+        for name, model in models.items():
+            names = feature_names(model)
+            if features is not None and names != features:
+                raise ValueError(f"Model {name} was trained on different features")
+            features = names
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=".export-", dir=self.root))
+        os.chmod(tmp, 0o755)
+        try:
+            entries = {}
+            for name, model in models.items():
+                fmt = _model_format(model)
+                filename = name + FORMAT_SUFFIXES[fmt]
+                save_native(model, tmp / filename, fmt)
+                entries[name] = {
+                    "file": filename,
+                    "format": fmt,
+                    "libraryVersion": _library_version(fmt),
+                    "bytes": (tmp / filename).stat().st_size
+                }
+            if pipeline is not None:
+                shutil.copyfile(pipeline, tmp / PIPELINE_FILE)
+
+            manifest = {
+                "format": REGISTRY_FORMAT,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "models": entries,
+                "features": features,
+                "dataHash": data_hash(train_files) if train_files else None,
+                "metrics": metrics or {},
+                "pipeline": PIPELINE_FILE if pipeline is not None else None
+            }
+            # The version number is taken at publish time so concurrent
+            # exports cannot claim the same name
+            while True:
+                existing = [int(v[1:]) for v in self.versions() if v[1:].isdigit()]
+                version = f"v{max(existing, default=0) + 1:04d}"
+                manifest["version"] = version
+                (tmp / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+                try:
+                    os.rename(tmp, self.root / version)
+                    return version
+                except OSError:
+                    if not (self.root / version).exists():
+                        raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def promote(self, version: str):
+        """Make ``version`` the one served; running services pick it up on their next check."""
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version {version!r}")
+        tmp = self.root / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+        tmp.write_text(version + "\n")
+        os.replace(tmp, self.current_path)
+
+    def open(self, version: str | None = None) -> ModelSet:
+        """Start loading ``version`` (default: the promoted one)."""
+        version = version or self.current_version()
+        if version is None:
+            raise ValueError(f"No model version promoted in {self.root}")
+        manifest = self.manifest(version)
+        if manifest.get("format") != REGISTRY_FORMAT:
+            raise ValueError(f"Unsupported registry format {manifest.get('format')} in {version}")
+        directory = self.root / version
+        loaders = {
+            name: (lambda path=directory / entry["file"], fmt=entry["format"]: _load_checked(path, fmt, manifest["features"]))
+            for name, entry in manifest["models"].items()
+        }
+        pipeline = directory / manifest["pipeline"] if manifest.get("pipeline") else None
+        return ModelSet(loaders, version=version, manifest=manifest, pipeline_path=pipeline)
+
+
+if __name__ == "__main__":
+    root = Path(os.environ.get("MODEL_DIR", Path(__file__).resolve().parent / "checkpoints"))
+    registry = ModelRegistry(root)
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "list":
+        current = registry.current_version()
+        for version in registry.versions():
+            manifest = registry.manifest(version)
+            marker = "*" if version == current else " "
+            print(f"{marker} {version}  {manifest['created']}  {', '.join(manifest['models'])}")
+    elif command == "promote" and len(sys.argv) > 2:
+        registry.promote(sys.argv[2])
+        print(f"Promoted {sys.argv[2]}")
+    else:
+        sys.exit("Usage: python models/registry.py [list | promote <version>]")
@@ -0,0 +1,145 @@
+"""Binary copy of the train/valid/test split in ``data/split/``.
+
+Next to the CSVs, ``data_final.py`` writes ``data/split/npy/``: one ``.npy``
+matrix per table (``X_train``, ``y_train``, ``values_df_train``, ...) plus a
+``manifest.json`` with each table's columns, dtype, row count and the stamp
+of the CSV written with it. ``load_table`` memory-maps the matrix into a
+DataFrame without parsing or copying it, and falls back to the CSV when the
+binary copy is missing or older than the CSV.
+
+Convert an existing CSV split with::
+
+    python models/split_store.py [data/split]
+"""
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+SPLIT_VERSION = 1
+
+BINARY_DIR = "npy"
+
+PARTS = ("train", "valid", "test")
+
+
+def _source_stamp(csv_path: Path) -> dict | None:
+    if not csv_path.exists():
+        return None
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _check_rows(tables: dict) -> None:
+    """Every table of one part (``X_train``, ``y_train``, ``values_df_train``) has the same rows."""
+    for part in PARTS:
+        rows = {name: len(table) for name, table in tables.items() if name.endswith("_" + part)}
+        if len(set(rows.values())) > 1:
+            counts = ", ".join(f"{name} {n}" for name, n in rows.items())
+            raise ValueError(f"Split part '{part}' has mismatched row counts: {counts}")
+
+
+def write_split(tables: dict[str, pd.DataFrame | pd.Series], split_dir: str | Path) -> Path:
+    """Write ``tables`` to ``split_dir/npy``, replacing any existing copy.
+
+    Each table becomes one C-ordered matrix (a vector for a Series) in the
+    common dtype of its columns. Write the CSVs first: their stamps mark the
+    binary copy as fresh.
+    """
+    _check_rows(tables)
+    split_dir = Path(split_dir)
+    path = split_dir / BINARY_DIR
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    entries = {}
+    for name, table in tables.items():
+        series = isinstance(table, pd.Series)
+        frame = table.to_frame() if series else table
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in frame.dtypes):
+            raise ValueError(f"Table {name} has non-numeric columns")
+        values = np.ascontiguousarray(table.to_numpy(np.result_type(*frame.dtypes)))
+        np.save(tmp / f"{name}.npy", values)
+        entries[name] = {
+            "file": f"{name}.npy",
+            "columns": [str(c) for c in frame.columns],
+            "dtype": values.dtype.str,
+            "rows": len(table),
+            "series": series,
+            "source": _source_stamp(split_dir / f"{name}.csv")
+        }
+
+    manifest = {"version": SPLIT_VERSION, "tables": entries}
+    (tmp / "manifest.json").write_text(json.dumps(manifest))
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+def _manifest(split_dir: Path) -> dict | None:
+    manifest_path = split_dir / BINARY_DIR / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    if manifest["version"] != SPLIT_VERSION:
+        raise ValueError(f"Unsupported split version {manifest['version']} in {manifest_path.parent}")
+    return manifest
+
+
+def read_table(split_dir: str | Path, name: str) -> pd.DataFrame | pd.Series:
+    """Map one table of the binary split; the values stay memory-mapped and read-only."""
+    split_dir = Path(split_dir)
+    manifest = _manifest(split_dir)
+    if manifest is None or name not in manifest["tables"]:
+        raise FileNotFoundError(f"No table {name} in {split_dir / BINARY_DIR}")
+    entry = manifest["tables"][name]
+    values = np.load(split_dir / BINARY_DIR / entry["file"], mmap_mode="r")
+    if entry["series"]:
+        return pd.Series(values, name=entry["columns"][0], copy=False)
+    return pd.DataFrame(values, columns=entry["columns"], copy=False)
+
+
+def read_csv_table(split_dir: str | Path, name: str) -> pd.DataFrame | pd.Series:
+    """Parse one table's CSV; a single-column table (a target) comes back as a Series."""
+    df = pd.read_csv(Path(split_dir) / f"{name}.csv")
+    # Splits written with their index carry it as a leading unnamed column
+    df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed:")])
+    return df.iloc[:, 0] if df.shape[1] == 1 else df
+
+
+def table_is_fresh(split_dir: str | Path, name: str) -> bool:
+    """Whether the binary copy of ``name`` was written with its current CSV.
+
+    Without the CSV any binary copy counts as fresh.
+    """
+    split_dir = Path(split_dir)
+    manifest = _manifest(split_dir)
+    if manifest is None or name not in manifest["tables"]:
+        return False
+    csv_path = split_dir / f"{name}.csv"
+    return not csv_path.exists() or manifest["tables"][name]["source"] == _source_stamp(csv_path)
+
+
+def has_table(split_dir: str | Path, name: str) -> bool:
+    return table_is_fresh(split_dir, name) or (Path(split_dir) / f"{name}.csv").exists()
+
+
+def load_table(split_dir: str | Path, name: str) -> pd.DataFrame | pd.Series:
+    """Map ``name`` from the binary split if it is fresh, else parse its CSV."""
+    if table_is_fresh(split_dir, name):
+        return read_table(split_dir, name)
+    return read_csv_table(split_dir, name)
+
+
+if __name__ == "__main__":
+    split_dir = Path(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "data" / "split")
+    names = sorted(p.stem for p in split_dir.glob("*.csv"))
+    out = write_split({name: read_csv_table(split_dir, name) for name in names}, split_dir)
+    print(f"Wrote {', '.join(names)} to {out}")
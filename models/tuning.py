@@ -0,0 +1,549 @@
+"""Successive-halving hyperparameter search with native early stopping.
+
+``SuccessiveHalvingSearch`` samples candidates from the same parameter
+grids as ``RandomizedSearchCV``, but the number of boosting rounds is the
+budget rather than a searched parameter. Every candidate is cross-validated
+with a small round budget, the best third moves on to three times the
+rounds, and so on up to the largest value in the grid. Each fit stops early
+on its validation fold through the library's own training API. A fold that
+stopped before its budget ran out is not trained again at a larger budget;
+its result would be the same.
+
+The best candidate is refit on all the data with the mean best iteration
+over its folds, as the scikit-learn wrapper the rest of the code loads.
+
+Fits run on a ``TrainingScheduler``: a fixed number of cores split into
+worker processes, each training one fold at a time with a fixed number of
+model threads, so trials and model threads never multiply past the budget.
+Several searches can share one scheduler and run at the same time.
+
+Each worker keeps every library's binned form of the CV folds (XGBoost
+quantile matrices, LightGBM datasets, quantized CatBoost pools), so the
+bins are computed once per fold and per set of binning parameters and
+reused by every later trial instead of being rebuilt for each fit.
+
+With a ``TrialJournal``, every fold fit is appended to a JSONL file as it
+finishes, keyed by a hash of the training data. A search that is restarted
+on the same data takes finished fits from the journal instead of running
+them again, and ``warm_start`` seeds a new search with the best candidates
+of earlier ones.
+"""
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold, ParameterSampler
+
+logger = logging.getLogger(__name__)
+
+
+class XGBoostBackend:
+    name = "xgb"
+    rounds_param = "n_estimators"
+
+    def __init__(self, random_state: int = 42):
+        self.random_state = random_state
+
+    def binning(self, params: dict) -> tuple:
+        """The parameters that shape the binned dataset."""
+        return (params.get("max_bin", 256),)
+
+    def datasets(self, train: tuple, valid: tuple, params: dict, threads: int) -> tuple:
+        import xgboost as xgb
+        dtrain = xgb.QuantileDMatrix(*train, max_bin=params.get("max_bin", 256), nthread=threads)
+        return dtrain, xgb.QuantileDMatrix(*valid, ref=dtrain, nthread=threads)
+
+    def train(self, params: dict, rounds: int, datasets: tuple, patience: int, threads: int) -> list[float]:
+        """Validation RMSE after every round until early stopping."""
+        import xgboost as xgb
+        dtrain, dvalid = datasets
+        history = {}
+        xgb.train(
+            {
+                "objective": "reg:squarederror",
+                "eval_metric": "rmse",
+                "seed": self.random_state,
+                "nthread": threads,
+                "verbosity": 0,
+                **params
+            },
+            dtrain,
+            num_boost_round=rounds,
+            evals=[(dvalid, "valid")],
+            early_stopping_rounds=patience,
+            evals_result=history,
+            verbose_eval=False
+        )
+        return history["valid"]["rmse"]
+
+    def estimator(self, params: dict, rounds: int, threads: int):
+        from xgboost import XGBRegressor
+        return XGBRegressor(
+            random_state=self.random_state, n_jobs=threads, verbosity=0,
+            **params, n_estimators=rounds
+        )
+
+
+class LightGBMBackend:
+    name = "lgbm"
+    rounds_param = "n_estimators"
+    # Dataset parameters; min_data_in_leaf also decides which features are pre-filtered
+    dataset_params = ("max_bin", "min_data_in_bin", "min_child_samples", "min_data_in_leaf")
+
+    def __init__(self, random_state: int = 42):
+        self.random_state = random_state
+
+    def binning(self, params: dict) -> tuple:
+        return tuple((k, params[k]) for k in self.dataset_params if k in params)
+
+    def datasets(self, train: tuple, valid: tuple, params: dict, threads: int) -> tuple:
+        import lightgbm as lgb
+        # Binned by the first lgb.train call, with that trial's parameters
+        dtrain = lgb.Dataset(*train, params={"verbosity": -1})
+        return dtrain, lgb.Dataset(*valid, reference=dtrain)
+
+    def train(self, params: dict, rounds: int, datasets: tuple, patience: int, threads: int) -> list[float]:
+        import lightgbm as lgb
+        dtrain, dvalid = datasets
+        history = {}
+        lgb.train(
+            {
+                "objective": "regression",
+                "metric": "rmse",
+                "seed": self.random_state,
+                "num_threads": threads,
+                "verbosity": -1,
+                **params
+            },
+            dtrain,
+            num_boost_round=rounds,
+            valid_sets=[dvalid],
+            valid_names=["valid"],
+            callbacks=[lgb.early_stopping(patience, verbose=False), lgb.record_evaluation(history)]
+        )
+        return history["valid"]["rmse"]
+
+    def estimator(self, params: dict, rounds: int, threads: int):
+        from lightgbm import LGBMRegressor
+        return LGBMRegressor(
+            random_state=self.random_state, n_jobs=threads, verbosity=-1,
+            **params, n_estimators=rounds
+        )
+
+
+class CatBoostBackend:
+    name = "catboost"
+    rounds_param = "iterations"
+
+    def __init__(self, random_state: int = 42):
+        self.random_state = random_state
+
+    def binning(self, params: dict) -> tuple:
+        return (params.get("border_count", 254),)
+
+    def datasets(self, train: tuple, valid: tuple, params: dict, threads: int) -> tuple:
+        from catboost import Pool
+        dtrain = Pool(*train)
+        dtrain.quantize(border_count=params.get("border_count", 254))
+        # The validation pool is quantized with the training pool's borders
+        with tempfile.TemporaryDirectory() as tmp:
+            borders = os.path.join(tmp, "borders.tsv")
+            dtrain.save_quantization_borders(borders)
+            dvalid = Pool(*valid)
+            dvalid.quantize(input_borders=borders)
+        return dtrain, dvalid
+
+    def train(self, params: dict, rounds: int, datasets: tuple, patience: int, threads: int) -> list[float]:
+        from catboost import CatBoostRegressor
+        dtrain, dvalid = datasets
+        model = CatBoostRegressor(
+            random_state=self.random_state, thread_count=threads, verbose=0, allow_writing_files=False,
+            **params, iterations=rounds, early_stopping_rounds=patience, use_best_model=False
+        )
+        model.fit(dtrain, eval_set=dvalid)
+        return model.get_evals_result()["validation"]["RMSE"]
+
+    def estimator(self, params: dict, rounds: int, threads: int):
+        from catboost import CatBoostRegressor
+        return CatBoostRegressor(
+            random_state=self.random_state, thread_count=threads, verbose=0,
+            **params, iterations=rounds
+        )
+
+
+BACKENDS = {
+    "xgb": XGBoostBackend,
+    "lgbm": LightGBMBackend,
+    "catboost": CatBoostBackend
+}
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def core_split(cores: int | None = None, threads: int = 1) -> tuple[int, int]:
+    """(trials run at once, threads per trial) within ``cores``."""
+    cores = cores or available_cores()
+    threads = max(1, min(threads, cores))
+    return max(1, cores // threads), threads
+
+
+def _as_arrays(X, y) -> tuple:
+    columns = [str(c) for c in X.columns] if isinstance(X, pd.DataFrame) else None
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(np.ravel(y), dtype=np.float64)
+    return X, y, columns
+
+
+def _digest(X: np.ndarray, y: np.ndarray, columns: list[str] | None) -> str:
+    digest = hashlib.sha256(X.tobytes())
+    digest.update(y.tobytes())
+    digest.update(json.dumps(columns).encode())
+    return digest.hexdigest()
+
+
+def dataset_hash(X, y) -> str:
+    """SHA-256 of the training data as float64 values, with the column names."""
+    return "sha256:" + _digest(*_as_arrays(X, y))
+
+
+# Worker-process state, built on first use: the folds of each shared dataset,
+# and each library's binned datasets per fold and binning parameters
+_folds = {}
+_datasets = {}
+
+
+def _load_shared(data: str) -> tuple:
+    X = np.load(os.path.join(data, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data, "y.npy"), mmap_mode="r")
+    with open(os.path.join(data, "columns.json")) as f:
+        columns = json.load(f)
+    return X, y, columns
+
+
+def _worker_folds(data: str, cv: int) -> list[tuple]:
+    if (data, cv) not in _folds:
+        X, y, _ = _load_shared(data)
+        _folds[data, cv] = [
+            ((X[train], y[train]), (X[valid], y[valid]))
+            for train, valid in KFold(n_splits=cv).split(X)
+        ]
+    return _folds[data, cv]
+
+
+def _fit_fold(backend, params: dict, rounds: int, data: str, cv: int, fold: int, patience: int, threads: int) -> dict:
+    # A worker runs one fit at a time, so its process CPU time is the fit's
+    start, cpu_start = time.perf_counter(), time.process_time()
+    key = (data, cv, fold, backend.name, backend.binning(params))
+    cached = key in _datasets
+    if not cached:
+        train, valid = _worker_folds(data, cv)[fold]
+        _datasets[key] = backend.datasets(train, valid, params, threads)
+    history = backend.train(params, rounds, _datasets[key], patience, threads)
+    best = int(np.argmin(history))
+    return {
+        "rmse": float(history[best]),
+        "best_iteration": best + 1,
+        "stopped": len(history) < rounds,
+        "seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "threads": threads,
+        "cached": cached
+    }
+
+
+def _refit(backend, params: dict, rounds: int, data: str, threads: int):
+    X, y, columns = _load_shared(data)
+    estimator = backend.estimator(params, rounds, threads)
+    estimator.fit(pd.DataFrame(np.asarray(X), columns=columns), np.asarray(y))
+    return estimator
+
+
+class TrainingScheduler:
+    """A fixed core budget shared by every search that uses it.
+
+    ``cores`` (default: the cores this process may run on) are split into
+    ``cores // threads`` worker processes, each running one fit at a time
+    with ``threads`` model threads. Training data is written once to a
+    temporary directory that the workers memory-map.
+    """
+
+    def __init__(self, cores: int | None = None, threads: int = 1):
+        self.cores = cores or available_cores()
+        self.workers, self.threads = core_split(self.cores, threads)
+        self._dir = tempfile.mkdtemp(prefix="tuning-")
+        self._lock = threading.Lock()
+        # Spawned workers start without the parent's threads or OpenMP state
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def share(self, X, y) -> str:
+        """Make ``X``/``y`` available to the workers; returns the handle fits take."""
+        X, y, columns = _as_arrays(X, y)
+        path = os.path.join(self._dir, _digest(X, y, columns)[:16])
+        with self._lock:
+            if not os.path.exists(path):
+                os.mkdir(path)
+                np.save(os.path.join(path, "X.npy"), X)
+                np.save(os.path.join(path, "y.npy"), y)
+                with open(os.path.join(path, "columns.json"), "w") as f:
+                    json.dump(columns, f)
+        return path
+
+    def submit(self, fn, *args):
+        return self._pool.submit(fn, *args)
+
+    def close(self):
+        self._pool.shutdown()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __enter__(self) -> "TrainingScheduler":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrialJournal:
+    """Append-only JSONL record of fold fits, reused across runs.
+
+    One line per fold fit: the library, data hash, parameters, fold,
+    round budget and result. A fit is looked up under the same settings
+    and the same budget, or a smaller one if that fit stopped early. A
+    line cut short by a crash is skipped when the journal is read.
+    """
+
+    FORMAT = 1
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fits = {}
+        self.skipped = 0
+        # Whether the last line was cut short and the next record must start a new one
+        self._torn = False
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    self._torn = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        self.skipped += 1
+                        continue
+                    if entry.get("format") == self.FORMAT:
+                        self._fits.setdefault(entry["key"], []).append(entry)
+
+    @staticmethod
+    def key(settings: dict, params: dict, fold: int) -> str:
+        return json.dumps({**settings, "params": params, "fold": fold}, sort_keys=True, default=float)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._fits.values())
+
+    def lookup(self, key: str, rounds: int) -> dict | None:
+        with self._lock:
+            for entry in self._fits.get(key, []):
+                if entry["rounds"] == rounds or (entry["result"]["stopped"] and entry["rounds"] < rounds):
+                    return dict(entry["result"])
+        return None
+
+    def record(self, key: str, settings: dict, params: dict, fold: int, rounds: int, result: dict):
+        entry = {
+            "format": self.FORMAT,
+            "key": key,
+            **settings,
+            "params": params,
+            "fold": fold,
+            "rounds": rounds,
+            "result": result
+        }
+        line = json.dumps(entry, default=float) + "\n"
+        with self._lock:
+            self._fits.setdefault(key, []).append(json.loads(line))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("\n" + line if self._torn else line)
+                self._torn = False
+                f.flush()
+                os.fsync(f.fileno())
+
+    def best(self, settings: dict, k: int) -> list[dict]:
+        """The ``k`` best parameter sets fitted under ``settings``.
+
+        Each fold counts with its fit at the largest budget; parameter sets
+        are ranked by mean RMSE over folds and need all ``settings["cv"]``.
+        """
+        folds = {}
+        with self._lock:
+            for entries in self._fits.values():
+                for entry in entries:
+                    if any(entry.get(name) != value for name, value in settings.items()):
+                        continue
+                    fits = folds.setdefault(json.dumps(entry["params"], sort_keys=True), {})
+                    if entry["rounds"] >= fits.get(entry["fold"], (0, None))[0]:
+                        fits[entry["fold"]] = (entry["rounds"], entry["result"]["rmse"])
+        scores = {
+            params: float(np.mean([rmse for _, rmse in fits.values()]))
+            for params, fits in folds.items()
+            if len(fits) == settings["cv"]
+        }
+        return [json.loads(params) for params in sorted(scores, key=scores.get)[:k]]
+
+
+class SuccessiveHalvingSearch:
+    """Successive halving over boosting rounds, cross-validated with early stopping.
+
+    ``param_grid`` is a ``RandomizedSearchCV``-style grid; its rounds entry
+    (``n_estimators`` or ``iterations``) only sets the largest budget. Fits
+    run on ``scheduler`` (a private one with the default budget if not
+    given). After ``fit``, ``best_params_`` (including the chosen number of
+    rounds), ``best_score_`` (negative RMSE, as scikit-learn reports it),
+    ``best_estimator_`` and one ``trials_`` entry per candidate and rung are
+    available; every fold records its wall and CPU time.
+
+    Fits are looked up in and recorded to ``journal`` when one is given;
+    ``warm_start`` puts that many of the journal's best candidates for the
+    same data and settings first in line, ahead of the sampled ones.
+    """
+
+    def __init__(
+        self,
+        backend,
+        param_grid: dict,
+        n_iter: int = 50,
+        cv: int = 5,
+        factor: int = 3,
+        min_rounds: int = 15,
+        early_stopping_rounds: int = 50,
+        random_state: int = 42,
+        scheduler: TrainingScheduler | None = None,
+        journal: TrialJournal | None = None,
+        warm_start: int = 0,
+        verbose: int = 1
+    ):
+        self.backend = backend
+        self.param_grid = {k: v for k, v in param_grid.items() if k != backend.rounds_param}
+        self.max_rounds = max(param_grid.get(backend.rounds_param, [1000]))
+        self.n_iter = n_iter
+        self.cv = cv
+        self.factor = factor
+        self.min_rounds = min_rounds
+        self.early_stopping_rounds = early_stopping_rounds
+        self.random_state = random_state
+        self.scheduler = scheduler
+        self.journal = journal
+        self.warm_start = warm_start
+        self.verbose = verbose
+
+    def rungs(self) -> list[int]:
+        """Round budgets from the first rung to the last."""
+        budgets = [self.max_rounds]
+        while budgets[-1] / self.factor >= self.min_rounds:
+            budgets.append(math.ceil(budgets[-1] / self.factor))
+        return budgets[::-1]
+
+    def fit(self, X, y) -> "SuccessiveHalvingSearch":
+        scheduler = self.scheduler or TrainingScheduler()
+        try:
+            self._fit(scheduler, scheduler.share(X, y), dataset_hash(X, y))
+        finally:
+            if scheduler is not self.scheduler:
+                scheduler.close()
+        return self
+
+    def _candidates(self, settings: dict) -> list[dict]:
+        sampled = list(ParameterSampler(self.param_grid, self.n_iter, random_state=self.random_state))
+        if self.journal is None or not self.warm_start:
+            return sampled
+        warm = self.journal.best(settings, self.warm_start)
+        if self.verbose and warm:
+            print(f"[{self.backend.name}] Warm start from {len(warm)} journal candidates")
+        return (warm + [p for p in sampled if p not in warm])[:max(self.n_iter, len(warm))]
+
+    def _fit(self, scheduler: TrainingScheduler, data: str, data_hash: str):
+        name = self.backend.name
+        settings = {
+            "library": name,
+            "dataHash": data_hash,
+            "cv": self.cv,
+            "patience": self.early_stopping_rounds,
+            "randomState": self.backend.random_state
+        }
+        candidates = self._candidates(settings)
+        done = [{} for _ in candidates]
+        alive = list(range(len(candidates)))
+        self.trials_ = []
+        scores = {}
+        for rung, rounds in enumerate(self.rungs()):
+            start = time.perf_counter()
+            # The whole rung is queued at once, so fits of other searches interleave with it
+            futures = {}
+            reused = 0
+            for c in alive:
+                for i in range(self.cv):
+                    if done[c].get(i, {}).get("stopped"):
+                        continue
+                    journaled = self.journal is not None and self.journal.lookup(
+                        self.journal.key(settings, candidates[c], i), rounds
+                    )
+                    if journaled:
+                        done[c][i] = journaled
+                        reused += 1
+                        continue
+                    futures[c, i] = scheduler.submit(
+                        _fit_fold, self.backend, candidates[c], rounds, data, self.cv, i,
+                        self.early_stopping_rounds, scheduler.threads
+                    )
+            cpu = 0.0
+            for (c, i), future in futures.items():
+                done[c][i] = fold = future.result()
+                cpu += fold["cpu_seconds"]
+                if self.journal is not None:
+                    self.journal.record(
+                        self.journal.key(settings, candidates[c], i), settings, candidates[c], i, rounds, fold
+                    )
+                logger.info(
+                    "%s rung %d candidate %d fold %d: best %d/%d rounds, RMSE %.4f, %.2fs wall, %.2fs CPU, %d threads, %s dataset",
+                    name, rung, c, i, fold["best_iteration"], rounds, fold["rmse"],
+                    fold["seconds"], fold["cpu_seconds"], fold["threads"], "cached" if fold["cached"] else "new"
+                )
+            for c in alive:
+                scores[c] = float(np.mean([done[c][i]["rmse"] for i in range(self.cv)]))
+                self.trials_.append({
+                    "candidate": c,
+                    "rung": rung,
+                    "rounds": rounds,
+                    "params": candidates[c],
+                    "rmse": scores[c],
+                    "folds": [dict(done[c][i]) for i in range(self.cv)]
+                })
+            if self.verbose:
+                print(
+                    f"[{name}] Rung {rung}: {len(alive)} candidates x {self.cv} folds, up to {rounds} rounds"
+                    f" ({time.perf_counter() - start:.1f}s, {cpu:.1f}s CPU, best RMSE {min(scores[c] for c in alive):.4f})"
+                    + (f", {reused} fits from the journal" if reused else "")
+                )
+            alive = sorted(alive, key=scores.get)[:max(1, len(alive) // self.factor)]
+
+        best = alive[0]
+        best_rounds = max(1, round(np.mean([done[best][i]["best_iteration"] for i in range(self.cv)])))
+        self.best_params_ = {**candidates[best], self.backend.rounds_param: best_rounds}
+        self.best_score_ = -scores[best]
+        self.best_estimator_ = scheduler.submit(
+            _refit, self.backend, candidates[best], best_rounds, data, scheduler.threads
+        ).result()
@@ -0,0 +1,63 @@
+"""Keyset cursors of /api/players that do not fit the sort column are rejected.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from synthetic import write_players_csv
+
+import data_service
+from data_service import PlayerDataService, encode_cursor
+from fastapi.testclient import TestClient
+from reloader import DataReloader
+import main
+
+
+class CursorTypeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        csv = write_players_csv(300, Path(cls.tmp.name) / "players.csv")
+        # An empty model directory: no predictions needed here
+        reloader = DataReloader(
+            lambda: PlayerDataService(csv, use_snapshot=False, model_dir=cls.tmp.name), csv, interval=0
+        )
+        cls.service = reloader.current
+        cls._get_reloader = data_service.get_reloader
+        data_service.get_reloader = lambda: reloader
+        cls.client = TestClient(main.app)
+
+    @classmethod
+    def tearDownClass(cls):
+        data_service.get_reloader = cls._get_reloader
+        cls.tmp.cleanup()
+
+    def test_text_value_for_numeric_sort(self):
+        cursor = encode_cursor(self.service.version, "MarketValueCurrent", False, "abc", 100001)
+        with self.assertRaises(ValueError):
+            self.service.get_players(sort_by="marketValue", cursor=cursor)
+        response = self.client.get("/api/players", params={"sortBy": "marketValue", "cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_numeric_value_for_text_sort(self):
+        cursor = encode_cursor(self.service.version, "name", True, 12.5, 100001)
+        response = self.client.get("/api/players", params={"sortBy": "name", "sortOrder": "asc", "cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_issued_cursors_still_page(self):
+        for sort_by in ("marketValue", "name"):
+            first = self.client.get("/api/players", params={"sortBy": sort_by, "limit": 5}).json()
+            response = self.client.get(
+                "/api/players", params={"sortBy": sort_by, "limit": 5, "cursor": first["nextCursor"]}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["players"]), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
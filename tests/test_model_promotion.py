@@ -0,0 +1,98 @@
+"""Promoting a model version changes ETags and drops cached /api/players pages.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from synthetic import write_players_csv
+
+import data_service
+from data_service import PlayerDataService
+from fastapi.testclient import TestClient
+from predictions import FeaturePipeline
+from registry import CURRENT_FILE, ModelRegistry
+from reloader import DataReloader
+import main
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+
+def train_version(registry: ModelRegistry, csv: Path, delta: float) -> str:
+    """Export a one-model version predicting roughly ``delta`` for every player."""
+    df = pd.read_csv(csv)
+    X = FeaturePipeline().fit(df).transform(df)
+    y = np.full(len(X), delta) + np.random.default_rng(0).normal(0, 0.01, len(X))
+    model = XGBRegressor(n_estimators=5, max_depth=2, random_state=42).fit(X, y)
+    return registry.export({"xgb": model})
+
+
+@unittest.skipIf(XGBRegressor is None, "xgboost is not installed")
+class ModelPromotionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        csv = write_players_csv(300, root / "players.csv")
+        self.registry = ModelRegistry(root / "models")
+        self.versions = [train_version(self.registry, csv, delta) for delta in (0.1, 0.6)]
+        self.registry.promote(self.versions[0])
+
+        self.reloader = DataReloader(
+            lambda: PlayerDataService(csv, use_snapshot=False, model_dir=self.registry.root),
+            csv,
+            interval=0,
+            extra_paths=(self.registry.root / CURRENT_FILE,)
+        )
+        self._get_reloader = data_service.get_reloader
+        data_service.get_reloader = lambda: self.reloader
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        data_service.get_reloader = self._get_reloader
+        self.tmp.cleanup()
+
+    def test_promotion_changes_etags_and_cached_pages(self):
+        params = {"sortBy": "predictedValue", "limit": 5}
+        page = self.client.get("/api/players", params=params)
+        # Served from the cache the second time
+        self.assertEqual(self.client.get("/api/players", params=params).content, page.content)
+        player_id = page.json()["players"][0]["playerId"]
+        detail = self.client.get(f"/api/players/{player_id}")
+
+        self.registry.promote(self.versions[1])
+        self.assertTrue(self.reloader.reload())
+        service = self.reloader.current
+        self.assertEqual(service.model_version, self.versions[1])
+
+        new_page = self.client.get("/api/players", params=params)
+        self.assertNotEqual(new_page.headers["ETag"], page.headers["ETag"])
+        expected, _, _ = service.get_players(sort_by="predictedValue", limit=5)
+        self.assertEqual(
+            [p["predictedValue"] for p in new_page.json()["players"]],
+            [p["predictedValue"] for p in expected]
+        )
+        self.assertNotEqual(new_page.json()["players"], page.json()["players"])
+
+        # The ETag from before the promotion no longer matches
+        revalidated = self.client.get(
+            f"/api/players/{player_id}", headers={"If-None-Match": detail.headers["ETag"]}
+        )
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated.json()["predictedValue"], detail.json()["predictedValue"])
+        self.assertEqual(
+            revalidated.json()["predictedValue"], service.get_player_by_id(player_id)["predictedValue"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Served predictions: reconstruction, summaries and details, snapshots, no-model fallback.
+
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from synthetic import write_players_csv
+
+from data_service import PlayerDataService
+from ensemble import EnsemblePredictor
+from predictions import PREDICTION_COLUMN, PREDICTION_PREFIX, FeaturePipeline
+from registry import ModelRegistry
+from snapshot import read_snapshot, snapshot_path_for, write_snapshot
+
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+
+
+@unittest.skipIf(XGBRegressor is None, "xgboost is not installed")
+class PredictionsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        cls.csv = write_players_csv(300, root / "players.csv")
+        df = pd.read_csv(cls.csv)
+        cls.features = FeaturePipeline().fit(df).transform(df)
+        y = np.random.default_rng(0).normal(0, 0.5, len(df))
+        cls.model = XGBRegressor(n_estimators=5, max_depth=2, random_state=42).fit(cls.features, y)
+        registry = ModelRegistry(root / "models")
+        registry.promote(registry.export({"xgb": cls.model}))
+        cls.model_dir = registry.root
+
+        # Without a saved pipeline the service fits one on the CSV's columns,
+        # as above, so the expected values use the same features
+        previous = df["MarketValuePrevious"].fillna(0).to_numpy(np.float64)
+        expected = np.expm1(np.log1p(previous) + cls.model.predict(cls.features).astype(np.float64))
+        cls.expected = dict(zip(df["playerId"].tolist(), expected.tolist()))
+        cls.service = PlayerDataService(cls.csv, use_snapshot=False, model_dir=cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_values_are_reconstructed_from_the_log_delta(self):
+        for player_id, value in list(self.expected.items())[:50]:
+            detail = self.service.get_player_by_id(player_id)
+            self.assertAlmostEqual(detail["predictedValue"], value, delta=abs(value) * 1e-5)
+            # One model: the ensemble value is that model's value
+            self.assertEqual(detail["predictedValues"], {"xgb": detail["predictedValue"]})
+
+    def test_summaries_and_details_agree(self):
+        players, _, _ = self.service.get_players(sort_by="predictedValue", limit=20)
+        values = [p["predictedValue"] for p in players]
+        self.assertEqual(values, sorted(values, reverse=True))
+        for player in players:
+            detail = self.service.get_player_by_id(player["playerId"])
+            self.assertEqual(player["predictedValue"], detail["predictedValue"])
+
+    def test_snapshot_keeps_predictions_at_full_precision(self):
+        path = snapshot_path_for(self.csv)
+        write_snapshot(self.service._df, path, self.csv, self.service.snapshot_arrays())
+        frame = read_snapshot(path).frame
+        for col in (PREDICTION_COLUMN, PREDICTION_PREFIX + "xgb"):
+            self.assertEqual(frame[col].dtype, np.float64)
+            np.testing.assert_array_equal(frame[col].to_numpy(), self.service._df[col].to_numpy())
+
+        mapped = PlayerDataService(self.csv, model_dir=self.model_dir)
+        for player_id in list(self.expected)[:20]:
+            self.assertEqual(
+                mapped.get_player_by_id(player_id)["predictedValue"],
+                self.service.get_player_by_id(player_id)["predictedValue"]
+            )
+
+    def test_no_models_no_predictions(self):
+        with tempfile.TemporaryDirectory() as empty:
+            service = PlayerDataService(self.csv, use_snapshot=False, model_dir=empty)
+        self.assertFalse(service.predictions_available)
+        players, _, _ = service.get_players(limit=10)
+        self.assertTrue(all(p["predictedValue"] is None for p in players))
+        detail = service.get_player_by_id(players[0]["playerId"])
+        self.assertIsNone(detail["predictedValue"])
+        self.assertEqual(detail["predictedValues"], {})
+
+    def test_misaligned_features_are_rejected(self):
+        ensemble = EnsemblePredictor({"xgb": self.model})
+        shuffled = self.features[self.features.columns[::-1]]
+        np.testing.assert_array_equal(
+            ensemble.predict_all(shuffled)["xgb"], ensemble.predict_all(self.features)["xgb"]
+        )
+        with self.assertRaises(ValueError):
+            ensemble.predict_all(self.features.drop(columns=["age"]))
+        ensemble.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""A shared snapshot directory is seeded from a fresh snapshot next to the CSV.
+
+Run with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from synthetic import write_players_csv
+
+from snapshot import Snapshot, ensure_snapshot, snapshot_path_for, write_snapshot
+
+
+class SnapshotSeedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.csv = write_players_csv(100, root / "players.csv")
+        self.frame = pd.read_csv(self.csv)[["playerId", "name", "age"]]
+        self.arrays = {"stat_percentiles": np.arange(300, dtype=np.float32).reshape(100, 3)}
+        self.shared = snapshot_path_for(self.csv, root / "shm")
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self) -> Snapshot:
+        self.builds += 1
+        return Snapshot(self.frame, self.arrays)
+
+    def test_fresh_baked_snapshot_is_copied(self):
+        write_snapshot(self.frame, snapshot_path_for(self.csv), self.csv, self.arrays)
+        snapshot = ensure_snapshot(self.csv, self.build, self.shared)
+        self.assertEqual(self.builds, 0)
+        pd.testing.assert_frame_equal(snapshot.frame, self.frame, check_dtype=False)
+        np.testing.assert_array_equal(snapshot.arrays["stat_percentiles"], self.arrays["stat_percentiles"])
+
+    def test_stale_baked_snapshot_is_rebuilt(self):
+        write_snapshot(self.frame, snapshot_path_for(self.csv), self.csv, self.arrays)
+        stat = self.csv.stat()
+        os.utime(self.csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        ensure_snapshot(self.csv, self.build, self.shared)
+        self.assertEqual(self.builds, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()